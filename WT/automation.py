@@ -0,0 +1,161 @@
+from numpy.typing import NDArray
+from filters import OnePole
+from typing import Union
+import numpy as np
+
+TWOPI = 2 * np.pi
+AUTOMATION_PARAMS = ["freqx", "freqy", "max_r", "center_x", "center_y"]
+LFO_SHAPES = ["sine", "triangle", "saw", "square"]
+RATES = ["control", "audio"]
+
+
+class Breakpoints():
+    def __init__(self, points: list[tuple[float, float]], mode: str = "lin", loop: bool = False) -> None:
+
+        """
+        INIT BREAKPOINT CURVE
+
+        Args
+        ----
+            points: list[tuple[float, float]]
+                (time in sec., value) pairs, times increasing. The first value holds before the first
+                point and the last one after the last point
+            mode: str
+                interpolation between points (default = "lin"):
+                    "lin": linear
+                    "exp": exponential (values must be > 0, e.g. frequencies)
+            loop: bool
+                repeat the curve every points[-1] time (default = False)
+        """
+
+        modes = ["lin", "exp"]
+        assert mode in modes, f"[ERROR] mode can be only: {modes}!"
+        assert len(points) > 0, "[ERROR] breakpoints needs at least one point!"
+        self.times = np.array([p[0] for p in points], dtype=np.float64)
+        self.points = np.array([p[1] for p in points], dtype=np.float64)
+        assert np.all(np.diff(self.times) >= 0), "[ERROR] breakpoint times must be increasing!"
+        if mode == "exp":
+            assert np.all(self.points > 0), "[ERROR] mode exp: values must be > 0!"
+        self.mode = mode
+        self.loop = loop
+
+    def values(self, t: NDArray) -> NDArray:
+
+        """
+        CURVE VALUES AT TIMES t (sec.)
+        """
+
+        if self.loop and self.times[-1] > 0:
+            t = np.mod(t, self.times[-1])
+        if self.mode == "exp":
+            return np.exp(np.interp(t, self.times, np.log(self.points)))
+        return np.interp(t, self.times, self.points)
+
+
+class LFO():
+    def __init__(self, freq: float, depth: float = 1.0, offset: float = 0.0, shape: str = "sine", phase: float = 0.0) -> None:
+
+        """
+        INIT LFO
+
+        value = offset + depth * shape(freq * t + phase), shapes are bipolar [-1, 1]
+
+        Args
+        ----
+            freq: float
+                frequency in Hz
+            depth: float
+                amplitude (default = 1.0)
+            offset: float
+                center value (default = 0.0)
+            shape: str
+                "sine", "triangle", "saw" or "square" (default = "sine")
+            phase: float
+                initial phase in cycles [0, 1) (default = 0.0)
+        """
+
+        assert shape in LFO_SHAPES, f"[ERROR] shape can be only: {LFO_SHAPES}!"
+        self.freq = freq
+        self.depth = depth
+        self.offset = offset
+        self.shape = shape
+        self.phase = phase
+
+    def values(self, t: NDArray) -> NDArray:
+
+        """
+        LFO VALUES AT TIMES t (sec.)
+        """
+
+        cycles = np.mod(self.freq * t + self.phase, 1.0)
+        match self.shape:
+            case "sine":
+                wave = np.sin(TWOPI * cycles)
+            case "triangle":
+                wave = 1 - 4 * np.abs(cycles - 0.5)
+            case "saw":
+                wave = 2 * cycles - 1
+            case "square":
+                wave = np.where(cycles < 0.5, 1.0, -1.0)
+        return self.offset + self.depth * wave
+
+
+class Automation():
+    def __init__(self, source: Union[Breakpoints, LFO], sr: int, smooth: float = 0.0, rate: str = "control") -> None:
+
+        """
+        INIT AUTOMATION (one parameter)
+
+        Args
+        ----
+            source: Breakpoints|LFO
+                any object with a values(t) method, t = times in sec.
+            sr: int
+                sampling rate in Hz
+            smooth: float
+                one pole smoothing time constant in sec. (default = 0.0, no smoothing)
+            rate: str
+                evaluation rate (default = "control"):
+                    "control": one value per block (start of the block)
+                    "audio": one value per sample
+        """
+
+        assert rate in RATES, f"[ERROR] rate can be only: {RATES}!"
+        self.source = source
+        self.sr = sr
+        self.smooth = smooth
+        self.rate = rate
+        self.coeff = float(np.exp(-1 / (smooth * sr))) if smooth > 0 else 0.0
+        self.__smoother = OnePole(coeff=self.coeff) if rate == "audio" and self.coeff > 0 else None
+        self.__state = None
+
+    def block(self, start: int, n: int) -> Union[float, NDArray]:
+
+        """
+        VALUES OF THE BLOCK [start, start + n) (samples since the beginning of the render)
+
+        Returns
+        -------
+            float|NDArray
+                one value (control rate) or n values (audio rate)
+        """
+
+        if self.rate == "control":
+            value = float(self.source.values(np.array([start / self.sr]))[0])
+            if self.__state is None or self.coeff == 0:
+                self.__state = value
+            else:
+                # smoothing over the n samples of this block: the value the smoother reaches
+                # at the end of the block, driven by the value at its start
+                self.__state = value + (self.__state - value) * self.coeff ** n
+            return self.__state
+
+        values = self.source.values((start + np.arange(n, dtype=np.float64)) / self.sr)
+        values = np.array(values, dtype=np.float64)
+        if self.__smoother is not None:
+            if self.__state is None:
+                # start from the first value, no ramp from 0
+                self.__smoother.reset(value=values[0])
+                self.__state = values[0]
+            self.__smoother.process(block=values)
+        return values
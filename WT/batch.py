@@ -0,0 +1,232 @@
+# import section
+import os
+# one blas thread per worker process, the pool provides the parallelism
+for var in ["OMP_NUM_THREADS", "OPENBLAS_NUM_THREADS", "MKL_NUM_THREADS"]:
+    os.environ.setdefault(var, "1")
+from wave_terrain import WaveTerrainSynthesis
+from evolution import TerrainEvolution
+from orbits import OrbitTypes, Orbit
+from envelopes import EnvelopeTypes, Envelope
+from interpolation import InterpolationTypes
+from terrain import Terrain
+from cache import TerrainCache
+from multiprocessing import Pool
+from collections import OrderedDict
+from typing import Union
+import numpy as np
+import soundfile as sf
+import itertools
+import argparse
+import json
+import time
+import csv
+
+# main scripts
+DEFAULTS = {
+    "name": "",
+    "seed": 1,
+    "width": 512,
+    "height": 512,
+    "xy_incr": 0.01,
+    "octaves": 1,
+    "orbit": "SPIRAL",
+    "center_x": 0.5,
+    "center_y": 0.5,
+    "freqx": 9000.0,
+    "freqy": 125.0,
+    "haptic_freq": 3.0, # surface updates per sec., with offset_incr > 0
+    "offset_incr": 0.0, # terrain evolution time offset per update (0 = static terrain)
+    "crossfade": 0.0, # crossfade between evolving surfaces in sec.
+    "max_r": 0.707,
+    "interpolation": "NEAREST",
+    "dur": 2.0,
+    "sr": 44100,
+    "env_dur": 0.1,
+    "atk": 0.001,
+    "decay": 0.0,
+    "release": -1.0, # < 0: env_dur - atk
+    "sustain_amp": 1.0,
+    "initial_amp": 0.0001,
+    "end_amp": 0.0001,
+    "env_mode": "exp",
+    "subtype": "PCM_16"
+}
+WORKER_TERRAINS = 2 # terrains kept per worker (renders are sorted by terrain)
+
+worker_terrains = OrderedDict()
+worker_cache = None
+
+def load_sweep(path: str) -> list[dict]:
+
+    """
+    LOAD A PARAMETER SWEEP
+
+    Args
+    ----
+        path: str
+            .csv file (one render per row, header = parameter names) or .json file:
+                list of renders (dict of parameters), or
+                dict of parameters, list values are swept (cartesian product)
+
+    Returns
+    -------
+        list[dict]
+            renders, missing parameters set to DEFAULTS
+    """
+
+    if path.endswith(".csv"):
+        with open(path, newline="") as f:
+            rows = [{k: v for k, v in row.items() if v not in (None, "")} for row in csv.DictReader(f)]
+    else:
+        with open(path) as f:
+            sweep = json.load(f)
+        if isinstance(sweep, dict):
+            keys = list(sweep.keys())
+            values = [v if isinstance(v, list) else [v] for v in sweep.values()]
+            rows = [dict(zip(keys, combination)) for combination in itertools.product(*values)]
+        else:
+            rows = sweep
+
+    renders = []
+    for i, row in enumerate(rows):
+        unknown = set(row) - set(DEFAULTS)
+        assert not unknown, f"[ERROR] unknown parameters: {unknown}!"
+        params = {k: parse_value(key=k, value=row[k]) if k in row else v for k, v in DEFAULTS.items()}
+        params["name"] = params["name"] or f"wt_{i:05d}"
+        assert params["seed"] > 0, f"[ERROR] {params['name']}: seed must be positive!"
+        renders.append(params)
+    return renders
+
+def parse_value(key: str, value: object) -> object:
+
+    """
+    PARSE A PARAMETER BY ITS DEFAULTS TYPE (csv values are strings)
+
+    Integer parameters must be whole numbers (no silent truncation).
+    """
+
+    kind = type(DEFAULTS[key])
+    if kind is int:
+        number = float(value)
+        assert number.is_integer(), f"[ERROR] {key} must be an integer, got {value}!"
+        return int(number)
+    return kind(value)
+
+def init_worker(cache_path: Union[str, None], cache_bytes: int) -> None:
+    global worker_cache
+    worker_cache = TerrainCache(path=cache_path, max_bytes=cache_bytes) if cache_path else None
+
+def get_terrain(params: dict) -> Terrain:
+
+    """
+    TERRAIN OF A RENDER, generated (or loaded from the cache) once per worker,
+    the WORKER_TERRAINS most recently used are kept
+    """
+
+    key = (params["width"], params["height"], params["xy_incr"], params["octaves"], params["seed"])
+    if key in worker_terrains:
+        worker_terrains.move_to_end(key)
+    else:
+        terrain = Terrain(
+            size=(params["width"], params["height"]),
+            xy_incr=(params["xy_incr"], params["xy_incr"]),
+            octaves=params["octaves"],
+            seed=params["seed"],
+            cache=worker_cache
+        )
+        terrain.surface
+        worker_terrains[key] = terrain
+        while len(worker_terrains) > WORKER_TERRAINS:
+            worker_terrains.popitem(last=False)
+    return worker_terrains[key]
+
+def render(params: dict, out_dir: str) -> str:
+
+    """
+    RENDER ONE SOUND TO out_dir/<name>.wav
+
+    Returns
+    -------
+        str
+            output file path
+    """
+
+    sr = params["sr"]
+    n_samples = int(params["dur"] * sr)
+
+    orbit = Orbit(orbit_type=OrbitTypes[params["orbit"]], center=(params["center_x"], params["center_y"]), seed=params["seed"])
+    if params["env_dur"] > 0:
+        release = params["release"] if params["release"] >= 0 else params["env_dur"] - params["atk"]
+        orbit.envelope = Envelope(
+            envelope_type=EnvelopeTypes.ADSR,
+            dur=params["env_dur"],
+            sr=sr,
+            atk=params["atk"],
+            decay=params["decay"],
+            release=release,
+            sustain_amp=params["sustain_amp"],
+            initial_amp=params["initial_amp"],
+            end_amp=params["end_amp"],
+            mode=params["env_mode"]
+        )
+
+    wt = WaveTerrainSynthesis(sr=sr, interpolation=InterpolationTypes[params["interpolation"]])
+    wt.terrain = get_terrain(params=params)
+    wt.orbit = orbit
+    if params["offset_incr"] != 0:
+        # surface updated haptic_freq times per sec. (generated inline, offline render)
+        wt.evolution = TerrainEvolution(terrain=wt.terrain, offset_incr=params["offset_incr"], crossfade=params["crossfade"])
+
+    y = wt.render(n_samples=n_samples, freqs=(params["freqx"], params["freqy"]), haptic_freq=params["haptic_freq"], max_r=params["max_r"])
+    # master envelope
+    y *= np.hanning(n_samples)
+
+    path = os.path.join(out_dir, f"{params['name']}.wav")
+    sf.write(path, y, sr, params["subtype"])
+    return path
+
+def render_job(job: tuple[dict, str]) -> str:
+    return render(params=job[0], out_dir=job[1])
+
+def run_batch(renders: list[dict], out_dir: str, jobs: int, cache_path: Union[str, None] = None, cache_bytes: int = 2 * 1024 ** 3) -> float:
+
+    """
+    RENDER A LIST OF RENDERS ON jobs WORKER PROCESSES
+
+    Returns
+    -------
+        float
+            elapsed time in sec.
+    """
+
+    os.makedirs(out_dir, exist_ok=True)
+    # renders sharing a terrain are sent to the same worker chunk when possible
+    renders = sorted(renders, key=lambda p: (p["width"], p["height"], p["xy_incr"], p["octaves"], p["seed"]))
+    chunksize = max(1, len(renders) // (jobs * 4))
+
+    start = time.perf_counter()
+    with Pool(processes=jobs, initializer=init_worker, initargs=(cache_path, cache_bytes)) as pool:
+        for _ in pool.imap_unordered(render_job, [(params, out_dir) for params in renders], chunksize=chunksize):
+            pass
+    return time.perf_counter() - start
+
+# main function
+def main() -> None:
+    parser = argparse.ArgumentParser(description="render a parameter sweep of wave terrain sounds")
+    parser.add_argument("sweep", help="parameter sweep (.json or .csv)")
+    parser.add_argument("-o", "--out", default="renders", help="output directory (default = renders)")
+    parser.add_argument("-j", "--jobs", type=int, default=os.cpu_count(), help="worker processes (default = cpu count)")
+    parser.add_argument("--cache", default=None, help="terrain cache directory (default = no disk cache)")
+    parser.add_argument("--cache-bytes", type=int, default=2 * 1024 ** 3, help="terrain cache size in bytes")
+    args = parser.parse_args()
+
+    renders = load_sweep(path=args.sweep)
+    elapsed = run_batch(renders=renders, out_dir=args.out, jobs=args.jobs, cache_path=args.cache, cache_bytes=args.cache_bytes)
+
+    rate = len(renders) / elapsed
+    print(f"[INFO] {len(renders)} renders in {elapsed:.2f} s: {rate:.2f} renders/s, {rate / args.jobs:.2f} renders/s per core ({args.jobs} workers)")
+
+
+# [MAIN PROGRAM]: if the module is being run as the main program, it calls the "main()" function
+if __name__ == "__main__":
+    main()
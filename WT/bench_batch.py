@@ -0,0 +1,35 @@
+# import section
+from batch import DEFAULTS, run_batch
+import tempfile
+import os
+
+# main scripts
+N_RENDERS = 64
+SEEDS = 4
+DUR = 1.0 # sec.
+SIZE = 256
+
+# main function
+def main() -> None:
+    # scaling is bounded by physical cores, more workers than cores only add scheduling overhead
+    cores = os.cpu_count() or 1
+    jobs = [j for j in [1, 2, 4, 8, 16] if j <= max(cores, 1)]
+    renders = [
+        dict(DEFAULTS, name=f"wt_{i:05d}", seed=1 + i % SEEDS, freqx=220.0 * (1 + i % 8), dur=DUR, width=SIZE, height=SIZE)
+        for i in range(N_RENDERS)
+    ]
+
+    print(f"[INFO] {N_RENDERS} renders of {DUR} s, {SEEDS} terrains {SIZE}x{SIZE}, {cores} cpus")
+    print(f"{'jobs':>6} {'time [s]':>10} {'renders/s':>10} {'speedup':>8} {'efficiency':>11}")
+    base = None
+    with tempfile.TemporaryDirectory() as tmp:
+        for j in jobs:
+            elapsed = run_batch(renders=renders, out_dir=tmp, jobs=j)
+            rate = N_RENDERS / elapsed
+            base = base or rate
+            print(f"{j:>6} {elapsed:>10.3f} {rate:>10.2f} {rate / base:>8.2f} {rate / base / j:>11.2f}")
+
+
+# [MAIN PROGRAM]: if the module is being run as the main program, it calls the "main()" function
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+# import section
+from wave_terrain import WaveTerrainSynthesis
+from orbits import OrbitTypes, Orbit
+from envelopes import EnvelopeTypes, Envelope
+from interpolation import InterpolationTypes
+from channels import ChannelTransform
+from terrain import Terrain
+import numpy as np
+import time
+
+# main scripts
+WIDTH, HEIGHT = 512, 512
+SR = 44100
+DUR = 2
+BLOCK = 512
+FREQS = (900.0, 125.0)
+CHANNELS = [1, 2, 4, 6, 8]
+INTERPOLATIONS = [InterpolationTypes.NEAREST, InterpolationTypes.BILINEAR]
+
+def make_synth(terrain: Terrain, interpolation: InterpolationTypes) -> WaveTerrainSynthesis:
+    orbit = Orbit(orbit_type=OrbitTypes.SPIRAL, center=(0.5, 0.5))
+    orbit.envelope = Envelope(envelope_type=EnvelopeTypes.ADSR, dur=0.1, sr=SR, atk=0.001, decay=0, release=0.099, sustain_amp=1.0, initial_amp=0.0001, end_amp=0.0001, mode="exp")
+    wt = WaveTerrainSynthesis(sr=SR, interpolation=interpolation)
+    wt.terrain = terrain
+    wt.orbit = orbit
+    return wt
+
+def make_channels(n_channels: int) -> list[ChannelTransform]:
+    # spread phases, every other channel mirrored
+    return [ChannelTransform(phase=(c / n_channels, c / n_channels), mirror=(c % 2 == 1, False)) for c in range(n_channels)]
+
+# main function
+def main() -> None:
+    terrain = Terrain(size=(WIDTH, HEIGHT), xy_incr=(0.01, 0.01), seed=1)
+    terrain.surface
+    n_blocks = int(DUR * SR) // BLOCK
+
+    print(f"{'interp':>10} {'channels':>8} {'instances [s]':>14} {'batched [s]':>12} {'speedup':>8}")
+    for interpolation in INTERPOLATIONS:
+        for n_channels in CHANNELS:
+            # one mono synth per channel, copied into the interleaved buffer
+            synths = [make_synth(terrain=terrain, interpolation=interpolation) for _ in range(n_channels)]
+            frames = np.zeros((BLOCK, n_channels), dtype=np.float64)
+            start = time.perf_counter()
+            for _ in range(n_blocks):
+                for c, wt in enumerate(synths):
+                    frames[:, c] = wt.render(n_samples=BLOCK, freqs=FREQS, haptic_freq=3, max_r=0.4)
+            separate = time.perf_counter() - start
+
+            wt = make_synth(terrain=terrain, interpolation=interpolation)
+            wt.channels = make_channels(n_channels=n_channels)
+            start = time.perf_counter()
+            for _ in range(n_blocks):
+                wt.process_frames(out_buffer=frames, freqs=FREQS, haptic_freq=3, max_r=0.4)
+            batched = time.perf_counter() - start
+
+            print(f"{interpolation.name:>10} {n_channels:>8} {separate:>14.4f} {batched:>12.4f} {separate / batched:>8.2f}")
+
+
+# [MAIN PROGRAM]: if the module is being run as the main program, it calls the "main()" function
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+# import section
+from wave_terrain import WaveTerrainSynthesis
+from orbits import OrbitTypes, Orbit
+from envelopes import EnvelopeTypes, Envelope
+from interpolation import InterpolationTypes
+from terrain import Terrain
+from stream import render_to_file
+from numpy.typing import NDArray, DTypeLike
+import numpy as np
+import soundfile as sf
+import tracemalloc
+import tempfile
+import time
+import sys
+import os
+
+# main scripts
+SR = 44100
+SIZES = [512, 2048, 4096]
+ORBITS = [OrbitTypes.CIRCULAR, OrbitTypes.SPIRAL]
+INTERPOLATIONS = [InterpolationTypes.BILINEAR, InterpolationTypes.BICUBIC]
+DUR = 2.0 # sec.
+BLOCK = 4096
+FREQS = (440.0, 125.0)
+ENVELOPE_DUR = 0.1
+
+def make_synth(size: int, orbit_type: OrbitTypes, interpolation: InterpolationTypes, dtype: DTypeLike) -> WaveTerrainSynthesis:
+    terrain = Terrain(size=(size, size), xy_incr=(4 / size, 4 / size), octaves=2, seed=1, dtype=dtype)
+    envelope = Envelope(
+        envelope_type=EnvelopeTypes.ADSR,
+        dur=ENVELOPE_DUR,
+        sr=SR,
+        atk=0.001,
+        decay=0,
+        release=ENVELOPE_DUR - 0.001,
+        sustain_amp=1.0,
+        initial_amp=0.0001,
+        end_amp=0.0001,
+        mode="exp",
+        dtype=dtype
+    )
+    orbit = Orbit(orbit_type=orbit_type, center=(0.5, 0.5), dtype=dtype)
+    orbit.envelope = envelope
+    wt = WaveTerrainSynthesis(sr=SR, interpolation=interpolation, dtype=dtype)
+    wt.terrain = terrain
+    wt.orbit = orbit
+    wt.wavetable = False
+    return wt
+
+def render(wt: WaveTerrainSynthesis, n_samples: int) -> tuple[NDArray, float]:
+    out = np.zeros(n_samples, dtype=wt.dtype)
+    start = time.perf_counter()
+    for i in range(0, n_samples, BLOCK):
+        wt.process_block(out_buffer=out[i:i + BLOCK], freqs=FREQS, haptic_freq=3, max_r=0.707)
+    return out, time.perf_counter() - start
+
+def block_peak(wt: WaveTerrainSynthesis) -> float:
+    # peak traced memory of one block (separate run, tracing slows down numpy)
+    out = np.zeros(BLOCK, dtype=wt.dtype)
+    tracemalloc.start()
+    wt.process_block(out_buffer=out, freqs=FREQS, haptic_freq=3, max_r=0.707)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak / 1024 ** 2
+
+def check_render_to_file() -> bool:
+
+    """
+    FLOAT32 CIRCULAR SYNTH (no envelope, wavetable path) THROUGH render_to_file
+
+    Returns
+    -------
+        bool
+            True if the file matches a float64 render of the same synth
+    """
+
+    n_samples = SR // 2
+    rendered = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for dtype in [np.float64, np.float32]:
+            wt = WaveTerrainSynthesis(sr=SR, interpolation=InterpolationTypes.BILINEAR, dtype=dtype)
+            wt.terrain = Terrain(size=(256, 256), xy_incr=(0.02, 0.02), seed=1, dtype=dtype)
+            wt.orbit = Orbit(orbit_type=OrbitTypes.CIRCULAR, center=(0.5, 0.5), dtype=dtype)
+            path = os.path.join(tmp, f"{np.dtype(dtype).name}.wav")
+            render_to_file(wt=wt, path=path, n_samples=n_samples, freqs=FREQS, haptic_freq=3, max_r=0.4, chunk_size=4096, subtype="FLOAT", progress=0)
+            rendered.append(sf.read(path)[0])
+    err = np.max(np.abs(rendered[1] - rendered[0]))
+    ok = len(rendered[1]) == n_samples and err < 1e-4
+    print(f"[INFO] float32 CIRCULAR render_to_file: max err {err:.1e} against float64 {'ok' if ok else 'MISMATCH'}")
+    return ok
+
+# main function
+def main() -> None:
+    if not check_render_to_file():
+        sys.exit(1)
+
+    n_samples = int(DUR * SR)
+    print(f"{'size':>6} {'orbit':>9} {'interp':>9} {'dtype':>8} {'surface [MB]':>13} {'block [MB]':>10} {'rtf':>8} {'max err':>10} {'snr [dB]':>9}")
+    for size in SIZES:
+        for orbit_type in ORBITS:
+            for interpolation in INTERPOLATIONS:
+                reference = None
+                for dtype in [np.float64, np.float32]:
+                    wt = make_synth(size=size, orbit_type=orbit_type, interpolation=interpolation, dtype=dtype)
+                    surface_mb = wt.terrain.surface.nbytes / 1024 ** 2
+                    y, elapsed = render(wt=wt, n_samples=n_samples)
+                    peak = block_peak(wt=wt)
+                    if reference is None:
+                        reference = y
+                        err, snr = "-", "-"
+                    else:
+                        diff = y.astype(np.float64) - reference
+                        err = f"{np.max(np.abs(diff)):.1e}"
+                        snr = f"{10 * np.log10(np.sum(reference ** 2) / np.sum(diff ** 2)):.1f}"
+                    print(f"{size:>6} {orbit_type.name:>9} {interpolation.name:>9} {np.dtype(dtype).name:>8} {surface_mb:>13.1f} {peak:>10.2f} {DUR / elapsed:>8.1f} {err:>10} {snr:>9}")
+
+
+# [MAIN PROGRAM]: if the module is being run as the main program, it calls the "main()" function
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+# import section
+import subprocess
+import sys
+import os
+
+# main scripts
+BUDGET = float(os.environ.get("WT_IMPORT_BUDGET", 0.5)) # sec.
+RUNS = 5
+MODULES = ["wave_terrain", "orbits", "envelopes", "terrain"]
+HEAVY = ["matplotlib", "librosa", "soundfile", "perlin_noise", "scipy", "numba"]
+
+CHECK = """
+import sys, time
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+heavy = [m for m in {heavy} if m in sys.modules]
+print(elapsed, ",".join(heavy))
+"""
+
+# main function
+def main() -> None:
+    here = os.path.dirname(os.path.abspath(__file__))
+    failed = False
+    print(f"budget: {BUDGET:.3f} s (WT_IMPORT_BUDGET), best of {RUNS} fresh interpreters")
+    print(f"{'module':>14} {'import [s]':>12} {'heavy modules loaded':>24}")
+    for module in MODULES:
+        times = []
+        for _ in range(RUNS):
+            out = subprocess.run(
+                [sys.executable, "-c", CHECK.format(module=module, heavy=HEAVY)],
+                cwd=here, capture_output=True, text=True, check=True
+            ).stdout.split()
+            times.append(float(out[0]))
+            heavy = out[1] if len(out) > 1 else "-"
+        best = min(times)
+        print(f"{module:>14} {best:>12.4f} {heavy:>24}")
+        failed |= best > BUDGET or heavy != "-"
+
+    if failed:
+        print("[ERROR] import time over budget or heavy modules imported!")
+        sys.exit(1)
+
+
+# [MAIN PROGRAM]: if the module is being run as the main program, it calls the "main()" function
+if __name__ == "__main__":
+    main()
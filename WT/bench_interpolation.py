@@ -0,0 +1,47 @@
+# import section
+from wave_terrain import WaveTerrainSynthesis
+from interpolation import InterpolationTypes
+from orbits import OrbitTypes, Orbit
+from terrain import Terrain
+from numpy.typing import NDArray
+import numpy as np
+import time
+
+# main scripts
+SIZES = [64, 128, 256, 512, 1024]
+REFERENCE_SIZE = 4096
+DOMAIN = 5.12 # noise coords covered by the surface, xy_incr = DOMAIN / size
+SEED = 1
+SR = 44100
+DUR = 1
+FREQX = 9000
+FREQY = 125
+HAPTIC_FREQ = 3
+MAX_R = 0.4
+
+def render(size: int, interpolation: InterpolationTypes) -> tuple[NDArray, float]:
+    terrain = Terrain(size=(size, size), xy_incr=(DOMAIN / size, DOMAIN / size), seed=SEED)
+    terrain.surface
+    wt = WaveTerrainSynthesis(sr=SR, interpolation=interpolation)
+    wt.terrain = terrain
+    wt.orbit = Orbit(orbit_type=OrbitTypes.CIRCULAR, center=(0.5, 0.5))
+    start = time.perf_counter()
+    y = wt.render(n_samples=int(DUR * SR), freqs=(FREQX, FREQY), haptic_freq=HAPTIC_FREQ, max_r=MAX_R)
+    return y, time.perf_counter() - start
+
+# main function
+def main() -> None:
+    reference, _ = render(size=REFERENCE_SIZE, interpolation=InterpolationTypes.BICUBIC)
+
+    print(f"reference: {REFERENCE_SIZE}x{REFERENCE_SIZE} bicubic")
+    print(f"{'size':>6} {'mode':>10} {'x realtime':>12} {'snr [dB]':>10}")
+    for size in SIZES:
+        for interpolation in InterpolationTypes:
+            y, elapsed = render(size=size, interpolation=interpolation)
+            snr = 10 * np.log10(np.sum(reference ** 2) / np.sum((y - reference) ** 2))
+            print(f"{size:>6} {interpolation.name:>10} {DUR / elapsed:>12.1f} {snr:>10.1f}")
+
+
+# [MAIN PROGRAM]: if the module is being run as the main program, it calls the "main()" function
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+# import section
+from filters import DCBlocker, OnePole
+from kernels import BACKENDS, numba_available, set_backend
+from wave_terrain import WaveTerrainSynthesis
+from orbits import OrbitTypes, Orbit
+from terrain import Terrain
+import numpy as np
+import time
+import sys
+
+# main scripts
+SR = 44100
+BLOCK = 512
+N_BLOCKS = 200
+COEFF = 0.999
+TOLERANCE = 1e-9
+SEED = 1
+
+def reference_dc(x: np.ndarray) -> np.ndarray:
+    # sample by sample recurrence
+    dc = DCBlocker(sr=SR)
+    return np.array([dc.process_sample(sample=s) for s in x.tolist()])
+
+def reference_one_pole(x: np.ndarray) -> np.ndarray:
+    y = np.zeros(len(x), dtype=np.float64)
+    yprev = 0.0
+    for n, s in enumerate(x.tolist()):
+        yprev = (1 - COEFF) * s + COEFF * yprev
+        y[n] = yprev
+    return y
+
+def blocks(stage: object, x: np.ndarray) -> tuple[np.ndarray, float]:
+    y = x.copy()
+    start = time.perf_counter()
+    for i in range(0, len(y), BLOCK):
+        stage.process(y[i:i + BLOCK])
+    return y, time.perf_counter() - start
+
+def render() -> np.ndarray:
+    terrain = Terrain(size=(256, 256), xy_incr=(0.01, 0.01), seed=SEED)
+    wt = WaveTerrainSynthesis(sr=SR)
+    wt.terrain = terrain
+    wt.orbit = Orbit(orbit_type=OrbitTypes.SPIRAL, center=(0.5, 0.5))
+    return np.concatenate([wt.render(n_samples=BLOCK, freqs=(9000, 125), haptic_freq=3, max_r=0.707) for _ in range(N_BLOCKS)])
+
+# main function
+def main() -> None:
+    rng = np.random.default_rng(SEED)
+    x = rng.uniform(-1, 1, size=BLOCK * N_BLOCKS) + 0.3
+    refs = {"dc blocker": reference_dc(x=x), "one pole": reference_one_pole(x=x)}
+    backends = [b for b in BACKENDS if b == "numpy" or numba_available()]
+    if not numba_available():
+        print("[INFO] numba not installed, numba backend not checked")
+
+    failed = False
+    renders = {}
+    print(f"parity against the sample by sample recurrence, tolerance {TOLERANCE:.0e}")
+    print(f"{'backend':>8} {'kernel':>12} {'max err':>10} {'time [s]':>10} {'x real time':>12}")
+    for backend in backends:
+        set_backend(name=backend)
+        # first call compiles (numba), not timed
+        blocks(stage=DCBlocker(sr=SR), x=x[:BLOCK])
+        blocks(stage=OnePole(coeff=COEFF), x=x[:BLOCK])
+        for name, stage in [("dc blocker", DCBlocker(sr=SR)), ("one pole", OnePole(coeff=COEFF))]:
+            y, elapsed = blocks(stage=stage, x=x)
+            err = np.max(np.abs(y - refs[name]))
+            failed |= err > TOLERANCE
+            print(f"{backend:>8} {name:>12} {err:>10.1e} {elapsed:>10.4f} {len(x) / SR / elapsed:>12.1f}")
+        renders[backend] = render()
+
+    for backend in backends[1:]:
+        err = np.max(np.abs(renders[backend] - renders["numpy"]))
+        failed |= err > TOLERANCE
+        print(f"render {backend} vs numpy: max err {err:.1e}")
+
+    set_backend(name="numpy")
+    if failed:
+        print("[ERROR] backends disagree!")
+        sys.exit(1)
+
+
+# [MAIN PROGRAM]: if the module is being run as the main program, it calls the "main()" function
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+# import section
+from wave_terrain import WaveTerrainSynthesis
+from orbits import OrbitTypes, Orbit
+from interpolation import InterpolationTypes
+from terrain import Terrain
+from numpy.typing import NDArray
+import numpy as np
+import time
+
+# main scripts
+SR = 44100
+OVERSAMPLING = 8
+BLOCK = 512
+N_BLOCKS = 64
+SIZE = 512
+OCTAVES = 4
+FREQS = [(125.0, 125.0), (1000.0, 125.0), (9000.0, 125.0)]
+MAX_R = 0.707
+BIASES = [0.0, -1.0, -1.5, -2.0]
+
+def render(freqs: tuple[float, float], sr: int, n_samples: int, mipmap: bool, bias: float, terrain: Terrain) -> NDArray:
+    wt = WaveTerrainSynthesis(sr=sr, interpolation=InterpolationTypes.BILINEAR)
+    wt.terrain = terrain
+    wt.orbit = Orbit(orbit_type=OrbitTypes.SPIRAL, center=(0.5, 0.5))
+    wt.mipmap = mipmap
+    wt.mipmap_bias = bias
+    out = np.zeros(n_samples, dtype=np.float64)
+    for i in range(0, n_samples, BLOCK):
+        wt.process_block(out_buffer=out[i:i + BLOCK], freqs=freqs, haptic_freq=3, max_r=MAX_R)
+    return out
+
+def band_spectrum(y: NDArray, sr: int, n_bins: int) -> NDArray:
+    # spectrum below 20 kHz, scaled to the length of a SR render
+    spectrum = np.fft.rfft(y) / (len(y) / (n_bins * 2 - 2))
+    return spectrum[:n_bins]
+
+# main function
+def main() -> None:
+    terrain = Terrain(size=(SIZE, SIZE), xy_incr=(0.01, 0.01), octaves=OCTAVES, seed=1)
+    n_samples = BLOCK * N_BLOCKS
+    freqs_axis = np.fft.rfftfreq(n_samples, 1 / SR)
+    band = (freqs_axis > 20) & (freqs_axis < 20000)
+    print(f"error against a {OVERSAMPLING}x oversampled render, band limited to 20 kHz")
+    print(f"{'freqx':>8} {'mipmap':>8} {'bias':>6} {'err [dB]':>10} {'time [s]':>10}")
+    for freqs in FREQS:
+        reference = render(freqs=freqs, sr=SR * OVERSAMPLING, n_samples=n_samples * OVERSAMPLING, mipmap=False, bias=0.0, terrain=terrain)
+        reference = band_spectrum(y=reference, sr=SR * OVERSAMPLING, n_bins=len(freqs_axis))
+        for mipmap, bias in [(False, 0.0)] + [(True, bias) for bias in BIASES]:
+            start = time.perf_counter()
+            y = render(freqs=freqs, sr=SR, n_samples=n_samples, mipmap=mipmap, bias=bias, terrain=terrain)
+            elapsed = time.perf_counter() - start
+            spectrum = np.fft.rfft(y)
+            err = np.sum(np.abs(spectrum[band] - reference[band]) ** 2) / np.sum(np.abs(reference[band]) ** 2)
+            bias_str = f"{bias:>6.1f}" if mipmap else f"{'-':>6}"
+            print(f"{freqs[0]:>8.0f} {str(mipmap):>8} {bias_str} {10 * np.log10(err):>10.2f} {elapsed:>10.4f}")
+
+
+# [MAIN PROGRAM]: if the module is being run as the main program, it calls the "main()" function
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,39 @@
+# import section
+from terrain import Terrain
+import numpy as np
+import time
+import os
+
+# main scripts
+SIZE = 4096
+XY_INCR = (0.01, 0.01)
+OCTAVES = 1
+SEED = 1
+EXECUTORS = ["thread", "process"]
+
+# main function
+def main() -> None:
+    max_workers = os.cpu_count() or 1
+    reference = None
+    base_time = None
+    print(f"size: {SIZE}x{SIZE}, cores: {max_workers}")
+    print(f"{'executor':>10} {'workers':>8} {'time [s]':>10} {'speedup':>10} {'efficiency':>11} {'identical':>10}")
+    for executor in EXECUTORS:
+        for workers in range(1, max_workers + 1):
+            terrain = Terrain(size=(SIZE, SIZE), xy_incr=XY_INCR, octaves=OCTAVES, seed=SEED, workers=workers, executor=executor)
+            start = time.perf_counter()
+            surface = terrain.generate_surface()
+            elapsed = time.perf_counter() - start
+
+            if reference is None:
+                reference = surface
+                base_time = elapsed
+            speedup = base_time / elapsed
+            identical = np.array_equal(surface, reference)
+            print(f"{executor:>10} {workers:>8} {elapsed:>10.4f} {speedup:>10.2f} {speedup / workers:>11.2f} {str(identical):>10}")
+            del surface
+
+
+# [MAIN PROGRAM]: if the module is being run as the main program, it calls the "main()" function
+if __name__ == "__main__":
+    main()
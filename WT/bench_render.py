@@ -0,0 +1,58 @@
+# import section
+from wave_terrain import WaveTerrainSynthesis
+from orbits import OrbitTypes, Orbit
+from envelopes import EnvelopeTypes, Envelope
+from terrain import Terrain
+import numpy as np
+import time
+
+# main scripts
+WIDTH, HEIGHT = 512, 512
+SR = 44100
+DUR = 2
+REPEAT = 3
+FREQS = (900.0, 125.0)
+BLOCKS = [64, 128, 256, 512, 1024, 2048, 4096, 44100]
+ORBITS = [OrbitTypes.CIRCULAR, OrbitTypes.SPIRAL, OrbitTypes.CAOS]
+# single voice real time factor target, measured at TARGET_BLOCK samples per block
+TARGET = 100
+TARGET_BLOCK = 1024
+
+def make_synth(terrain: Terrain, orbit_type: OrbitTypes) -> WaveTerrainSynthesis:
+    orbit = Orbit(orbit_type=orbit_type, center=(0.5, 0.5))
+    if orbit_type != OrbitTypes.CIRCULAR:
+        orbit.envelope = Envelope(envelope_type=EnvelopeTypes.ADSR, dur=0.1, sr=SR, atk=0.001, decay=0, release=0.099, sustain_amp=1.0, initial_amp=0.0001, end_amp=0.0001, mode="exp")
+    wt = WaveTerrainSynthesis(sr=SR)
+    wt.terrain = terrain
+    wt.orbit = orbit
+    return wt
+
+def realtime_factor(wt: WaveTerrainSynthesis, block: int) -> float:
+    # best of REPEAT renders of DUR seconds, block by block
+    out_buffer = np.zeros(block, dtype=np.float64)
+    n_blocks = max(1, int(DUR * SR) // block)
+    best = float("inf")
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        for _ in range(n_blocks):
+            wt.process_block(out_buffer=out_buffer, freqs=FREQS, haptic_freq=3, max_r=0.4)
+        best = min(best, time.perf_counter() - start)
+    return n_blocks * block / SR / best
+
+# main function
+def main() -> None:
+    terrain = Terrain(size=(WIDTH, HEIGHT), xy_incr=(0.01, 0.01), seed=1)
+    terrain.surface
+
+    print(f"[INFO] single voice target: {TARGET}x real time at {TARGET_BLOCK} samples per block")
+    print(f"{'orbit':>10} " + " ".join(f"{block:>8}" for block in BLOCKS))
+    for orbit_type in ORBITS:
+        rtfs = [realtime_factor(wt=make_synth(terrain=terrain, orbit_type=orbit_type), block=block) for block in BLOCKS]
+        print(f"{orbit_type.name:>10} " + " ".join(f"{rtf:>7.1f}x" for rtf in rtfs))
+        target = rtfs[BLOCKS.index(TARGET_BLOCK)]
+        print(f"{'':>10} {'ok' if target >= TARGET else 'below target'} ({target:.1f}x at {TARGET_BLOCK} samples)")
+
+
+# [MAIN PROGRAM]: if the module is being run as the main program, it calls the "main()" function
+if __name__ == "__main__":
+    main()
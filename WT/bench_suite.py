@@ -0,0 +1,208 @@
+# import section
+from wave_terrain import WaveTerrainSynthesis
+from orbits import OrbitTypes, Orbit
+from envelopes import EnvelopeTypes, Envelope, build_envelope
+from terrain import Terrain
+from typing import Callable, Union
+import numpy as np
+import soundfile as sf
+import tracemalloc
+import tempfile
+import platform
+import argparse
+import json
+import time
+import sys
+import os
+
+# main scripts
+SR = 44100
+TERRAIN_SIZES = [128, 256, 512, 1024]
+TERRAIN_OCTAVES = [1, 2, 4]
+SURFACE_SIZE = 512
+RENDER_DUR = 1.0 # sec.
+SAMPLE_COUNT = 2000
+FREQS = (9000.0, 125.0)
+HAPTIC_FREQ = 3
+MAX_R = 0.707
+ENVELOPE_DUR = 0.1
+REPEATS = 3
+THRESHOLD = 0.2 # 20% slower than the baseline
+
+def measure(run: Callable[[], None], repeats: int) -> tuple[float, float]:
+
+    """
+    BEST TIME AND PEAK MEMORY OF A BENCHMARK
+
+    Args
+    ----
+        run: Callable
+            benchmark body, setup excluded
+        repeats: int
+            number of timed runs, the best one is kept
+
+    Returns
+    -------
+        tuple[float, float]
+            time in sec. and peak traced memory in MB (separate run, tracing slows down numpy)
+    """
+
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        run()
+        best = min(best, time.perf_counter() - start)
+
+    tracemalloc.start()
+    run()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return best, peak / 1024 ** 2
+
+def make_envelope() -> Envelope:
+    return Envelope(
+        envelope_type=EnvelopeTypes.ADSR,
+        dur=ENVELOPE_DUR,
+        sr=SR,
+        atk=0.001,
+        decay=0,
+        release=ENVELOPE_DUR - 0.001,
+        sustain_amp=1.0,
+        initial_amp=0.0001,
+        end_amp=0.0001,
+        mode="exp"
+    )
+
+def make_synth(terrain: Terrain, orbit_type: OrbitTypes, signal: str) -> WaveTerrainSynthesis:
+    orbit = Orbit(orbit_type=orbit_type, center=(0.5, 0.5), seed=1)
+    if orbit_type == OrbitTypes.SIG:
+        orbit.orbit_sig = signal
+    orbit.envelope = make_envelope()
+    wt = WaveTerrainSynthesis(sr=SR)
+    wt.terrain = terrain
+    wt.orbit = orbit
+    return wt
+
+def run_suite(repeats: int) -> dict:
+
+    """
+    RUN EVERY BENCHMARK
+
+    Returns
+    -------
+        dict
+            name -> {"time_s", "peak_mb"} (+ "rtf", real time factor, for the synthesis benchmarks)
+    """
+
+    results = {}
+
+    def add(name: str, run: Callable[[], None], audio_dur: Union[float, None] = None) -> None:
+        elapsed, peak = measure(run=run, repeats=repeats)
+        results[name] = {"time_s": elapsed, "peak_mb": peak}
+        if audio_dur is not None:
+            results[name]["rtf"] = audio_dur / elapsed
+        rtf = f"{audio_dur / elapsed:>10.1f}" if audio_dur is not None else f"{'-':>10}"
+        print(f"{name:>32} {elapsed:>12.5f} {rtf} {peak:>10.2f}")
+
+    print(f"{'benchmark':>32} {'time [s]':>12} {'rtf':>10} {'peak [MB]':>10}")
+
+    for size in TERRAIN_SIZES:
+        for octaves in TERRAIN_OCTAVES:
+            terrain = Terrain(size=(size, size), xy_incr=(0.01, 0.01), octaves=octaves, seed=1)
+            add(name=f"terrain/{size}/oct{octaves}", run=terrain.generate_surface)
+
+    def create_envelope() -> None:
+        # shared envelopes are cached, measure the construction itself
+        build_envelope.cache_clear()
+        make_envelope().create_envelope()
+    add(name="envelope/create", run=create_envelope)
+
+    terrain = Terrain(size=(SURFACE_SIZE, SURFACE_SIZE), xy_incr=(0.01, 0.01), seed=1)
+    terrain.surface
+    n_samples = int(RENDER_DUR * SR)
+    with tempfile.TemporaryDirectory() as tmp:
+        # SIG orbit source, generated so the suite runs offline
+        signal = os.path.join(tmp, "signal.wav")
+        rng = np.random.default_rng(1)
+        sf.write(signal, rng.uniform(0, 0.5, size=(SR, 2)), SR)
+
+        for orbit_type in OrbitTypes:
+            wt = make_synth(terrain=terrain, orbit_type=orbit_type, signal=signal)
+            add(
+                name=f"render/{orbit_type.name}",
+                run=lambda: wt.render(n_samples=n_samples, freqs=FREQS, haptic_freq=HAPTIC_FREQ, max_r=MAX_R),
+                audio_dur=RENDER_DUR
+            )
+            wt = make_synth(terrain=terrain, orbit_type=orbit_type, signal=signal)
+            add(
+                name=f"get_sample/{orbit_type.name}",
+                run=lambda: [wt.get_sample(freqs=FREQS, haptic_freq=HAPTIC_FREQ, max_r=MAX_R) for _ in range(SAMPLE_COUNT)],
+                audio_dur=SAMPLE_COUNT / SR
+            )
+            if orbit_type == OrbitTypes.SIG:
+                wt.orbit.orbit_sig.close()
+    return results
+
+def compare(results: dict, baseline: dict, threshold: float) -> list[str]:
+
+    """
+    BENCHMARKS SLOWER THAN THE BASELINE BY MORE THAN threshold
+
+    Returns
+    -------
+        list[str]
+            regression messages
+    """
+
+    regressions = []
+    print(f"\n{'benchmark':>32} {'baseline [s]':>12} {'now [s]':>12} {'ratio':>8}")
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+        ratio = result["time_s"] / baseline[name]["time_s"]
+        flag = " <- regression" if ratio > 1 + threshold else ""
+        print(f"{name:>32} {baseline[name]['time_s']:>12.5f} {result['time_s']:>12.5f} {ratio:>8.2f}{flag}")
+        if flag:
+            regressions.append(f"{name}: {ratio:.2f}x the baseline time")
+    return regressions
+
+# main function
+def main() -> None:
+    parser = argparse.ArgumentParser(description="wave terrain synthesis benchmark suite")
+    parser.add_argument("--save", default=None, help="write the results as a json baseline")
+    parser.add_argument("--compare", default=None, help="json baseline to compare with")
+    parser.add_argument("--threshold", type=float, default=THRESHOLD, help="max slowdown before flagging a regression (default = 0.2)")
+    parser.add_argument("--repeats", type=int, default=REPEATS, help="timed runs per benchmark, the best is kept (default = 3)")
+    args = parser.parse_args()
+
+    results = run_suite(repeats=args.repeats)
+    report = {
+        "meta": {
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "machine": platform.machine(),
+            "processor": platform.processor(),
+            "cpu_count": os.cpu_count(),
+            "date": time.strftime("%Y-%m-%dT%H:%M:%S")
+        },
+        "results": results
+    }
+
+    if args.save is not None:
+        with open(args.save, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"[INFO] baseline saved to {args.save}")
+
+    if args.compare is not None:
+        with open(args.compare) as f:
+            baseline = json.load(f)["results"]
+        regressions = compare(results=results, baseline=baseline, threshold=args.threshold)
+        if regressions:
+            print("[ERROR] regressions found!\n" + "\n".join(regressions))
+            sys.exit(1)
+        print("[INFO] no regressions")
+
+
+# [MAIN PROGRAM]: if the module is being run as the main program, it calls the "main()" function
+if __name__ == "__main__":
+    main()
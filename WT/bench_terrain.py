@@ -0,0 +1,37 @@
+# import section
+from terrain import Terrain
+import numpy as np
+import time
+
+# main scripts
+SIZES = [64, 128, 256, 512, 1024, 2048, 4096]
+PERLIN_MAX_SIZE = 256
+XY_INCR = (0.01, 0.01)
+OCTAVES = 1
+SEED = 1
+
+# main function
+def main() -> None:
+    print(f"{'size':>10} {'numpy [s]':>12} {'perlin [s]':>12} {'speedup':>10} {'max err':>10}")
+    for size in SIZES:
+        terrain = Terrain(size=(size, size), xy_incr=XY_INCR, octaves=OCTAVES, seed=SEED, backend="numpy")
+        start = time.perf_counter()
+        surface = terrain.generate_surface()
+        numpy_time = time.perf_counter() - start
+
+        if size > PERLIN_MAX_SIZE:
+            print(f"{size:>10} {numpy_time:>12.4f} {'-':>12} {'-':>10} {'-':>10}")
+            continue
+
+        reference = Terrain(size=(size, size), xy_incr=XY_INCR, octaves=OCTAVES, seed=SEED, backend="perlin")
+        start = time.perf_counter()
+        ref_surface = reference.generate_surface()
+        perlin_time = time.perf_counter() - start
+
+        err = np.max(np.abs(surface - ref_surface))
+        print(f"{size:>10} {numpy_time:>12.4f} {perlin_time:>12.4f} {perlin_time / numpy_time:>10.1f} {err:>10.1e}")
+
+
+# [MAIN PROGRAM]: if the module is being run as the main program, it calls the "main()" function
+if __name__ == "__main__":
+    main()
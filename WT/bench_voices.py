@@ -0,0 +1,38 @@
+# import section
+from voices import VoiceManager
+from orbits import OrbitTypes, Orbit
+from terrain import Terrain
+import time
+
+# main scripts
+WIDTH, HEIGHT = 512, 512
+SR = 44100
+DUR = 2
+BLOCK = 512
+VOICES = [1, 2, 4, 8, 16, 32, 64]
+
+# main function
+def main() -> None:
+    terrain = Terrain(size=(WIDTH, HEIGHT), xy_incr=(0.01, 0.01), seed=1)
+    terrain.surface
+    n_blocks = int(DUR * SR) // BLOCK
+
+    print(f"{'voices':>8} {'time [s]':>10} {'x realtime':>12} {'voices x realtime':>18}")
+    for n_voices in VOICES:
+        manager = VoiceManager(terrain=terrain, n_voices=n_voices, sr=SR)
+        for i in range(n_voices):
+            orbit = Orbit(orbit_type=OrbitTypes.CIRCULAR, center=(0.5, 0.5))
+            manager.note_on(orbit=orbit, freqs=(110 * (i + 1), 55 * (i + 2)), max_r=0.4, amp=1 / n_voices)
+
+        start = time.perf_counter()
+        for _ in range(n_blocks):
+            manager.render(n_samples=BLOCK)
+        elapsed = time.perf_counter() - start
+
+        realtime = n_blocks * BLOCK / SR / elapsed
+        print(f"{n_voices:>8} {elapsed:>10.4f} {realtime:>12.1f} {realtime * n_voices:>18.1f}")
+
+
+# [MAIN PROGRAM]: if the module is being run as the main program, it calls the "main()" function
+if __name__ == "__main__":
+    main()
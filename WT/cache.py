@@ -0,0 +1,178 @@
+from numpy.typing import NDArray
+from typing import Callable
+import numpy as np
+import hashlib
+import tempfile
+import time
+import os
+
+DEFAULT_CACHE_BYTES = 2 * 1024 ** 3
+# temp files older than this are left over by a writer that died (removed on eviction)
+STALE_TMP_SECONDS = 3600
+
+
+class TerrainCache():
+    def __init__(self, path: str, max_bytes: int = DEFAULT_CACHE_BYTES) -> None:
+
+        """
+        INIT TERRAIN CACHE
+
+        Surfaces are stored as .npy files and loaded back memory mapped (read only), so
+        large surfaces are paged in lazily and shared by every process using the cache.
+        Files are written atomically (temp file + rename, with the default permissions of
+        the process umask), the least recently used ones are removed when the cache grows
+        over max_bytes (temp files included, stale ones are removed). Several processes
+        can share the same cache directory.
+
+        Args
+        ----
+            path: str
+                cache directory (created if missing)
+            max_bytes: int
+                max cache size in bytes (default = 2 GiB)
+        """
+
+        self.path = path
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(self.path, exist_ok=True)
+        # mkstemp files are private (0600), cached files get the usual 0666 & ~umask
+        umask = os.umask(0)
+        os.umask(umask)
+        self.mode = 0o666 & ~umask
+
+    def filename(self, key: tuple) -> str:
+
+        """
+        CACHE FILE OF A KEY
+
+        Args
+        ----
+            key: tuple
+                surface parameters (see Terrain.key)
+
+        Returns
+        -------
+            str
+                .npy file path
+        """
+
+        digest = hashlib.sha1(repr(key).encode()).hexdigest()
+        return os.path.join(self.path, f"{digest}.npy")
+
+    def load(self, key: tuple, generate: Callable[[], NDArray]) -> NDArray:
+
+        """
+        LOAD (OR GENERATE AND STORE) A SURFACE
+
+        Args
+        ----
+            key: tuple
+                surface parameters (see Terrain.key)
+            generate: Callable[[], NDArray]
+                called to generate the surface on a miss
+
+        Returns
+        -------
+            NDArray
+                memory mapped surface (read only)
+        """
+
+        filename = self.filename(key=key)
+        try:
+            surface = np.load(filename, mmap_mode="r")
+            os.utime(filename)
+            self.hits += 1
+            return surface
+        except (FileNotFoundError, ValueError):
+            # missing, or evicted/replaced by another process while loading
+            pass
+
+        self.misses += 1
+        surface = generate()
+        fd, tmp = tempfile.mkstemp(dir=self.path, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                np.save(f, surface)
+            os.chmod(tmp, self.mode)
+            os.replace(tmp, filename)
+        except BaseException:
+            os.remove(tmp)
+            raise
+        self.evict(keep=filename)
+        try:
+            return np.load(filename, mmap_mode="r")
+        except FileNotFoundError:
+            # evicted by another process in the meantime
+            surface.flags.writeable = False
+            return surface
+
+    def evict(self, keep: str = "") -> None:
+
+        """
+        REMOVE THE LEAST RECENTLY USED SURFACES OVER max_bytes
+
+        Temp files being written count toward max_bytes, the ones older than
+        STALE_TMP_SECONDS (left over by a writer that died) are removed.
+
+        Args
+        ----
+            keep: str
+                file never removed (default = "")
+        """
+
+        entries = []
+        total = 0
+        now = time.time()
+        for name in os.listdir(self.path):
+            if not name.endswith((".npy", ".tmp")):
+                continue
+            filename = os.path.join(self.path, name)
+            try:
+                stat = os.stat(filename)
+            except FileNotFoundError:
+                continue
+            if name.endswith(".tmp"):
+                if now - stat.st_mtime > STALE_TMP_SECONDS:
+                    try:
+                        os.remove(filename)
+                        continue
+                    except FileNotFoundError:
+                        # already removed by another process
+                        continue
+                    except OSError:
+                        # still open (windows), counted until the next eviction
+                        pass
+                total += stat.st_size
+                continue
+            entries.append((stat.st_mtime, stat.st_size, filename))
+
+        total += sum(size for _, size, _ in entries)
+        for _, size, filename in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            if filename == keep:
+                continue
+            try:
+                os.remove(filename)
+            except FileNotFoundError:
+                # already removed by another process
+                pass
+            except OSError:
+                # still mapped (windows)
+                continue
+            total -= size
+
+    def clear(self) -> None:
+
+        """
+        REMOVE EVERY CACHED SURFACE
+        """
+
+        for name in os.listdir(self.path):
+            if name.endswith(".npy"):
+                try:
+                    os.remove(os.path.join(self.path, name))
+                except OSError:
+                    continue
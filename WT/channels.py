@@ -0,0 +1,70 @@
+from numpy.typing import NDArray
+import numpy as np
+
+
+class ChannelTransform():
+    def __init__(
+        self,
+        phase: tuple[float, float] = (0.0, 0.0),
+        ratio: tuple[float, float] = (1.0, 1.0),
+        mirror: tuple[bool, bool] = (False, False)
+    ) -> None:
+
+        """
+        INIT CHANNEL TRANSFORM (one output channel of a multichannel render, see WaveTerrainSynthesis.channels)
+
+        Every channel reads the same surface along the same orbit (envelope, center, max_r),
+        transformed by:
+
+        Args
+        ----
+            phase: tuple[float, float]
+                x and y phase offsets in cycles [0, 1) (default = (0.0, 0.0))
+            ratio: tuple[float, float]
+                x and y frequency ratios, channel freqs = freqs * ratio (default = (1.0, 1.0))
+            mirror: tuple[bool, bool]
+                mirror the orbit around the surface middle, x -> 1 - x and/or y -> 1 - y
+                (mirrored center and direction, default = (False, False))
+        """
+
+        assert all(r > 0 for r in ratio), "[ERROR] ratio must be positive!"
+        self.phase = phase
+        self.ratio = ratio
+        self.mirror = mirror
+
+
+def stereo(phase: float = 0.25) -> list[ChannelTransform]:
+
+    """
+    STEREO PAIR, the right channel is shifted by phase cycles on both axes
+
+    Args
+    ----
+        phase: float
+            right channel phase offset in cycles (default = 0.25)
+
+    Returns
+    -------
+        list[ChannelTransform]
+            left and right channels
+    """
+
+    return [ChannelTransform(), ChannelTransform(phase=(phase, phase))]
+
+def channel_arrays(channels: list[ChannelTransform]) -> tuple[NDArray, NDArray, NDArray, NDArray]:
+
+    """
+    CHANNEL TRANSFORMS AS ARRAYS (one row per channel)
+
+    Returns
+    -------
+        tuple[NDArray, NDArray, NDArray, NDArray]
+            phase offsets (channels, 2), ratios (channels, 2), mirror scales (channels, 2, 1)
+            and mirror offsets (channels, 2, 1): coord = offset + scale * coord
+    """
+
+    assert len(channels) > 0, "[ERROR] at least one channel is needed!"
+    phases = np.array([c.phase for c in channels], dtype=np.float64)
+    ratios = np.array([c.ratio for c in channels], dtype=np.float64)
+    mirror = np.array([c.mirror for c in channels], dtype=bool)[..., None]
+    return phases, ratios, np.where(mirror, -1.0, 1.0), np.where(mirror, 1.0, 0.0)
@@ -1,17 +1,95 @@
 from enum import Enum
 import numpy as np
+from numpy.typing import NDArray, DTypeLike
 from typing import Union
-import matplotlib.pyplot as plt
+from functools import lru_cache
+from instrument import Instrument
 
 
 WARN_SAMPLES = 4
 DEFAULT_INITIAL_EXP_AMP = 0.0001
 DEFAULT_END_EXP_AMP = 0.001
+ENV_CACHE_SIZE = 32
 
 class EnvelopeTypes(Enum):
     HANNING = 1
     ADSR = 3
 
+def segment(start: float, stop: float, n: int, mode: str) -> NDArray:
+    
+    """
+    ENVELOPE SEGMENT
+    
+    Args
+    ----
+        start: float
+            first value
+        stop: float
+            value reached after n samples (excluded)
+        n: int
+            number of samples
+        mode: str
+            "lin" or "exp" (geometric progression)
+    
+    Returns
+    -------
+    NDArray
+        segment values
+    """
+    
+    if n <= 0:
+        return np.zeros(0, dtype=np.float64)
+    if mode == "lin":
+        return np.linspace(start, stop, n, endpoint=False)
+    return start * (stop / start) ** (np.arange(n) / n)
+
+@lru_cache(maxsize=ENV_CACHE_SIZE)
+def build_envelope(
+    envelope_type: EnvelopeTypes,
+    lenght: int,
+    atk_samples: int,
+    decay_samples: int,
+    sustain_samples: int,
+    release_samples: int,
+    initial_amp: float,
+    sustain_amp: float,
+    end_amp: float,
+    mode: str,
+    dtype: str = "float64"
+) -> NDArray:
+    
+    """
+    BUILD ENVELOPE (cached on the parameters)
+    
+    Returns
+    -------
+    NDArray
+        envelope, read only since it is shared by every Envelope with the same parameters
+    """
+    
+    match envelope_type.name:
+        case 'HANNING':
+            env = np.hanning(lenght)
+        case "ADSR":
+            env = np.zeros(lenght)
+            # each segment starts where the original sample loops started
+            start_atk = WARN_SAMPLES
+            env[np.arange(start_atk, start_atk + atk_samples)] = segment(start=initial_amp, stop=1 - initial_amp if mode == "exp" else 1, n=atk_samples, mode=mode)
+            start_decay = atk_samples
+            env[np.arange(start_decay, start_decay + decay_samples)] = segment(start=1.0, stop=sustain_amp, n=decay_samples, mode=mode)
+            start_sustain = atk_samples + decay_samples
+            env[np.arange(start_sustain, start_sustain + sustain_samples)] = sustain_amp
+            start_release = atk_samples + decay_samples + sustain_samples
+            env[np.arange(start_release, start_release + release_samples)] = segment(start=sustain_amp, stop=end_amp, n=release_samples, mode=mode)
+        case _:
+            print("[ERROR] envelope type not implemented!\n")
+            exit(1)
+    
+    # built in float64, stored in the compute dtype
+    env = env.astype(dtype, copy=False)
+    env.flags.writeable = False
+    return env
+
 class Envelope():
     def __init__(
         self, 
@@ -24,7 +102,8 @@ class Envelope():
         initial_amp: float = 0,
         sustain_amp: float = 1,
         end_amp: float = 0,
-        mode: str = "lin"
+        mode: str = "lin",
+        dtype: DTypeLike = np.float64
     ) -> None:
         
         """
@@ -65,9 +144,13 @@ class Envelope():
                     - the value of initial_amp, sustain_amp and end_amp is from 0.0 to 1.0
                     - the duration of sustain segment is equal to dur - (atk + decay + release)
             
+            dtype: DTypeLike
+                envelope dtype, np.float64 or np.float32 (default = np.float64)
+            
         """
         
         self.envelope_type = envelope_type
+        self.dtype = np.dtype(dtype)
         self.dur = dur
         self.sr = sr        
         self.env = None
@@ -90,6 +173,8 @@ class Envelope():
                 self.end_amp = DEFAULT_END_EXP_AMP
         
         self.__index = 0
+        # profiling hooks, None = disabled (see instrument.py)
+        self.instrument: Union[Instrument, None] = None
     
     @property
     def envelope_t(self) -> int:
@@ -103,10 +188,13 @@ class Envelope():
         
         """
         CREATE ENVELOPE
+        
+        Envelopes with the same parameters are built once and shared (read only, see build_envelope)
         """
         
+        prof = self.instrument
+        start = prof.clock() if prof is not None else 0
         self.lenght = int(self.dur * self.sr)
-        env = np.zeros(self.lenght)
         
         self.atk = self.atk if self.atk is not None else 0.0
         atk_samples = int(self.atk * self.sr) - WARN_SAMPLES
@@ -120,58 +208,21 @@ class Envelope():
         
         assert self.lenght >= (atk_samples + decay_samples + release_samples + sustain_samples), "[ERROR] atk, decay, release and sustain durs summation must be less then total length of envelope!"
         
-        match self.envelope_type.name:
-            case 'HANNING':
-                self.env = np.hanning(self.lenght)
-            case "ADSR":
-                # atk
-                initial_amp = self.initial_amp
-                linear_step = (1 - self.initial_amp) / atk_samples
-                exp_step = np.exp(np.log((1 - self.initial_amp) / self.initial_amp) / atk_samples) if self.mode == "exp" else 0.0
-                start_atk = WARN_SAMPLES
-                for a in range(atk_samples):
-                    if self.mode == "lin":
-                        atk_value = self.initial_amp + linear_step * a
-                    else:
-                        atk_value = initial_amp
-                        initial_amp *= exp_step
-                    env[start_atk + a] = atk_value
-                
-                # decay
-                linear_step = (1 - self.sustain_amp) / decay_samples if self.mode == "lin" and decay_samples else 0.0
-                exp_step = np.exp(np.log(self.sustain_amp) / decay_samples) if self.mode == "exp" and decay_samples else 0.0
-                initial_amp = 1.0
-                start_decay = atk_samples
-                for d in range(decay_samples):
-                    if self.mode == "lin":
-                        decay_value = 1 - linear_step * d
-                    else:
-                        decay_value = initial_amp
-                        initial_amp *= exp_step
-                    env[start_decay + d] = decay_value
-                
-                # sustain
-                start_sustain = atk_samples + decay_samples
-                for s in range(sustain_samples):
-                    env[start_sustain + s] = self.sustain_amp
-                
-                # release
-                linear_step = (self.sustain_amp - self.end_amp) / release_samples if self.mode == "lin" and release_samples else 0.0
-                exp_step = np.exp(np.log(self.end_amp / self.sustain_amp) / release_samples) if self.mode == "exp" and release_samples else 0.0
-                initial_amp = self.sustain_amp
-                start_release = atk_samples + decay_samples + sustain_samples
-                for r in range(release_samples):
-                    if self.mode == "lin":
-                        release_value = self.sustain_amp - linear_step * r
-                    else:
-                        release_value = initial_amp
-                        initial_amp *= exp_step
-                    env[start_release + r] = release_value
-                
-                self.env = env
-            case _:
-                print("[ERROR] envelope type not implemented!\n")
-                exit(1)
+        self.env = build_envelope(
+            envelope_type=self.envelope_type,
+            lenght=self.lenght,
+            atk_samples=atk_samples,
+            decay_samples=decay_samples,
+            sustain_samples=sustain_samples,
+            release_samples=release_samples,
+            initial_amp=self.initial_amp,
+            sustain_amp=self.sustain_amp,
+            end_amp=self.end_amp,
+            mode=self.mode,
+            dtype=self.dtype.name
+        )
+        if prof is not None:
+            prof.record(stage="envelope.create", start=start)
     
     def generate_env_factor(self) -> float:
         
@@ -189,12 +240,39 @@ class Envelope():
         self.__index %= self.lenght
         return sample_env
     
+    def generate_env_block(self, n: int) -> NDArray:
+        
+        """
+        GENERATE ENV BLOCK
+        
+        Args
+        ----
+            n: int
+                number of samples
+    
+        Returns
+        -------
+        NDArray
+            values by which to multiply the next n signal samples (wraps around like generate_env_factor)
+        """
+        
+        prof = self.instrument
+        start = prof.clock() if prof is not None else 0
+        block_env = np.take(self.env, np.arange(self.__index, self.__index + n), mode="wrap")
+        self.__index = (self.__index + n) % self.lenght
+        if prof is not None:
+            prof.record(stage="envelope.block", start=start)
+        return block_env
+    
     def show_env(self) -> None:
         
         """
         SHOW THE ENV GRAPH
         """
         
+        # imported here, plotting is not needed for rendering
+        import matplotlib.pyplot as plt
+        
         self.create_envelope()
         plt.stem(np.linspace(0, self.dur, self.lenght), self.env)
         plt.xlabel(xlabel="time[s]")
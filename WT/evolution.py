@@ -0,0 +1,146 @@
+from numpy.typing import NDArray
+from terrain import Terrain
+from mipmap import TerrainPyramid
+from typing import Union
+import threading
+
+
+class TerrainEvolution():
+    def __init__(self, terrain: Terrain, offset_incr: float = 0.01, crossfade: float = 0.0) -> None:
+
+        """
+        INIT TERRAIN EVOLUTION
+
+        The next surface is generated ahead of time (on a worker thread once started)
+        by advancing the terrain time offset, and is double buffered: the synth swaps
+        to it at the haptic rate without waiting for the generation.
+
+        Args
+        ----
+            terrain: Terrain
+                terrain object (see terrain.py)
+            offset_incr: float
+                time offset increment between two consecutive surfaces (default = 0.01)
+            crossfade: float
+                crossfade duration in sec. between two surfaces (default = 0.0, swap)
+        """
+
+        self.terrain = terrain
+        self.offset_incr = offset_incr
+        self.crossfade = crossfade
+        self.surface = self.terrain.generate_surface(time_offset=0.0)
+        # pyramid of the current surface (see enable_mipmap), None if not built
+        self.pyramid: Union[TerrainPyramid, None] = None
+        self.mipmap = False
+
+        self.ready = 0
+        self.late = 0
+
+        self.__step = 0
+        self.__next = None
+        self.__running = False
+        self.__worker = None
+        self.__cond = threading.Condition()
+
+    @property
+    def metrics(self) -> dict[str, int]:
+
+        """
+        SURFACE METRICS
+
+        Returns
+        -------
+            dict[str, int]
+                ready: surfaces ready before needed
+                late: surfaces not ready when needed (the current surface is kept)
+        """
+
+        return {"ready": self.ready, "late": self.late}
+
+    def start(self) -> None:
+
+        """
+        START THE WORKER THREAD
+        """
+
+        if self.__running:
+            return
+        self.__running = True
+        self.__worker = threading.Thread(target=self.__run, daemon=True)
+        self.__worker.start()
+
+    def stop(self) -> None:
+
+        """
+        STOP THE WORKER THREAD
+        """
+
+        if not self.__running:
+            return
+        with self.__cond:
+            self.__running = False
+            self.__cond.notify()
+        self.__worker.join()
+        self.__worker = None
+
+    def enable_mipmap(self) -> None:
+
+        """
+        BUILD A PYRAMID WITH EVERY NEXT SURFACE (see mipmap.py)
+
+        The pyramids are built by the worker next to the surfaces and handed over with
+        them, so mipmapped lookups never build one on the audio path. The pyramid of the
+        current surface is built here (call it from the control thread).
+        """
+
+        self.mipmap = True
+        surface = self.surface
+        if self.pyramid is None or self.pyramid.levels[0] is not surface:
+            self.pyramid = TerrainPyramid(surface=surface)
+
+    def next_surface(self) -> Union[NDArray, None]:
+
+        """
+        NEXT SURFACE
+
+        With the worker running it never blocks on the generation. Without the worker
+        the next surface (and pyramid) is generated here (offline rendering). The pyramid
+        of the returned surface is in self.pyramid (None without mipmap).
+
+        Returns
+        -------
+            NDArray|None
+                next surface, None if it is not ready yet
+        """
+
+        if not self.__running:
+            self.__step += 1
+            self.surface = self.terrain.generate_surface(time_offset=self.__step * self.offset_incr)
+            self.pyramid = TerrainPyramid(surface=self.surface) if self.mipmap else None
+            return self.surface
+
+        with self.__cond:
+            if self.__next is None:
+                self.late += 1
+                return None
+            surface, pyramid = self.__next
+            self.__next = None
+            self.ready += 1
+            self.__cond.notify()
+        self.surface = surface
+        self.pyramid = pyramid
+        return surface
+
+    def __run(self) -> None:
+        while True:
+            with self.__cond:
+                while self.__running and self.__next is not None:
+                    self.__cond.wait()
+                if not self.__running:
+                    return
+                step = self.__step + 1
+            surface = self.terrain.generate_surface(time_offset=step * self.offset_incr)
+            pyramid = TerrainPyramid(surface=surface) if self.mipmap else None
+            with self.__cond:
+                self.__next = (surface, pyramid)
+                self.__step = step
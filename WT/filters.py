@@ -0,0 +1,362 @@
+from numpy.typing import NDArray, DTypeLike
+from typing import Union
+import numpy as np
+import math
+import kernels
+
+TWOPI = 2 * np.pi
+DBLOCK_ORDER = 3
+DBLOCK_FREQ = 10
+DBLOCK_CHUNK = 64
+
+
+def one_pole_response(coeff: float, dtype: DTypeLike = np.float64) -> tuple[NDArray, NDArray]:
+
+    """
+    IMPULSE RESPONSE OF y[n] = x[n] + coeff * y[n - 1] OVER A CHUNK
+
+    Returns
+    -------
+        tuple[NDArray, NDArray]
+            lower triangular response matrix and decay of the previous output across the chunk
+    """
+
+    lags = np.arange(DBLOCK_CHUNK)[:, None] - np.arange(DBLOCK_CHUNK)[None, :]
+    response = np.where(lags >= 0, coeff ** np.maximum(lags, 0), 0.0)
+    decay = coeff ** np.arange(1, DBLOCK_CHUNK + 1)
+    return response.astype(dtype), decay.astype(dtype)
+
+def solve_one_pole(x: NDArray, yprev: Union[float, NDArray], response: NDArray, decay: NDArray, out: NDArray) -> Union[float, NDArray]:
+
+    """
+    SOLVE y[n] = x[n] + coeff * y[n - 1] CHUNK BY CHUNK
+
+    Args
+    ----
+        x: NDArray
+            input, zero padded to a multiple of the chunk size, shape (samples, ) or (samples, channels)
+        yprev: float|NDArray
+            previous output (one for each channel)
+        response: NDArray
+            chunk response (see one_pole_response)
+        decay: NDArray
+            previous output decay (see one_pole_response)
+        out: NDArray
+            output, len(out) <= len(x) samples are written (can share memory with x)
+
+    Returns
+    -------
+        float|NDArray
+            last output (one for each channel)
+    """
+
+    n = len(out)
+    chunks = len(x) // DBLOCK_CHUNK
+    if x.ndim == 2:
+        # every channel at once, chunk by chunk
+        yout = response @ x.reshape(chunks, DBLOCK_CHUNK, x.shape[1])
+        carry = np.zeros((chunks, x.shape[1]), dtype=x.dtype)
+        for c in range(chunks):
+            carry[c] = yprev
+            yprev = yout[c, -1] + yprev * decay[-1]
+        yout += carry[:, None, :] * decay[None, :, None]
+        out[:] = yout.reshape(-1, x.shape[1])[:n]
+        return out[-1]
+    yout = x.reshape(chunks, DBLOCK_CHUNK) @ response.T
+    # previous output entering each chunk, carried on python floats
+    carry = []
+    chunk_decay = float(decay[-1])
+    for yend in yout[:, -1].tolist():
+        carry.append(yprev)
+        yprev = yend + yprev * chunk_decay
+    yout += np.multiply.outer(np.array(carry, dtype=x.dtype), decay)
+    out[:] = yout.reshape(-1)[:n]
+    return out[-1]
+
+
+class DCBlocker():
+    def __init__(self, sr: int = 44100, freq: float = DBLOCK_FREQ, order: int = DBLOCK_ORDER, dtype: DTypeLike = np.float64, channels: Union[int, None] = None) -> None:
+
+        """
+        INIT DC BLOCKER
+
+        Cascade of one pole high pass stages, y[n] = x[n] - x[n - 1] + coeff * y[n - 1].
+        Blocks are processed in place, the filter state is carried between calls.
+
+        Args
+        ----
+            sr: int
+                sampling rate in Hz
+            freq: float
+                cutoff frequency in Hz (default = 10)
+            order: int
+                number of stages (default = 3)
+            dtype: DTypeLike
+                compute dtype of the block solve (default = np.float64), the state is kept in float64
+            channels: int|None
+                None: 1D blocks (default), int: interleaved blocks, shape (frames, channels),
+                one filter state for each channel
+        """
+
+        self.sr = sr
+        self.order = order
+        self.coeff = 1 - (TWOPI * freq / self.sr)
+        self.dtype = np.dtype(dtype)
+        # x[n - 1] and y[n - 1] of each stage
+        self.channels = channels
+        self.state = np.zeros((2, self.order) + ((channels, ) if channels is not None else ()), dtype=np.float64)
+
+        # response of one stage over a chunk (see solve_one_pole)
+        self.__response, self.__decay = one_pole_response(coeff=self.coeff, dtype=self.dtype)
+
+    def reset(self) -> None:
+        self.state[:] = 0.0
+
+    def process(self, block: NDArray) -> NDArray:
+
+        """
+        PROCESS A BLOCK
+
+        Same output as the sample by sample recurrence (exact for one sample blocks and
+        with the numba backend, within floating point rounding otherwise, see kernels.py).
+
+        Args
+        ----
+            block: NDArray
+                1D block (or (frames, channels) block, see channels), filtered in place
+
+        Returns
+        -------
+            NDArray
+                block
+        """
+
+        n = len(block)
+        if n == 0:
+            return block
+        if n == 1:
+            block[0] = self.process_sample(sample=block[0])
+            return block
+        if kernels.backend == "numba":
+            if block.ndim == 1:
+                kernels.dc_block(block=block, state=self.state, coeff=self.coeff)
+            else:
+                for c in range(block.shape[1]):
+                    kernels.dc_block(block=block[:, c], state=self.state[..., c], coeff=self.coeff)
+            return block
+
+        chunks = -(-n // DBLOCK_CHUNK)
+        diff = np.zeros((chunks * DBLOCK_CHUNK, ) + block.shape[1:], dtype=self.dtype)
+        if block.ndim == 1:
+            # on python floats, the state array is read and written once
+            xprev, yprev = self.state.tolist()
+            for i in range(self.order):
+                diff[0] = block[0] - xprev[i]
+                np.subtract(block[1:], block[:-1], out=diff[1:n])
+                xprev[i] = float(block[-1])
+                yprev[i] = float(solve_one_pole(x=diff, yprev=yprev[i], response=self.__response, decay=self.__decay, out=block))
+            self.state[0] = xprev
+            self.state[1] = yprev
+            return block
+        for i in range(self.order):
+            # y[n] = x[n] - x[n - 1] + coeff * y[n - 1]
+            diff[0] = block[0] - self.state[0, i]
+            np.subtract(block[1:], block[:-1], out=diff[1:n])
+            self.state[0, i] = block[-1]
+            self.state[1, i] = solve_one_pole(x=diff, yprev=self.state[1, i], response=self.__response, decay=self.__decay, out=block)
+        return block
+
+    def process_sample(self, sample: float) -> float:
+
+        """
+        PROCESS ONE SAMPLE
+
+        Args
+        ----
+            sample: float
+                input sample (or one for each channel)
+
+        Returns
+        -------
+            float
+                filtered sample (or one for each channel)
+        """
+
+        if self.channels is not None:
+            xtemp = sample
+            yout = 0
+            for i in range(self.order):
+                yout = xtemp - self.state[0, i] + self.coeff * self.state[1, i]
+                self.state[0, i] = xtemp
+                self.state[1, i] = yout
+                xtemp = yout
+            return yout
+
+        # on python floats, the state array is read and written once
+        xprev, yprev = self.state.tolist()
+        xtemp = float(sample)
+        yout = 0.0
+        for i in range(self.order):
+            yout = xtemp - xprev[i] + self.coeff * yprev[i]
+            xprev[i] = xtemp
+            yprev[i] = yout
+            xtemp = yout
+        self.state[0] = xprev
+        self.state[1] = yprev
+        return yout
+
+
+class OnePole():
+    def __init__(self, coeff: float) -> None:
+
+        """
+        INIT ONE POLE LOW PASS (smoother)
+
+        y[n] = (1 - coeff) * x[n] + coeff * y[n - 1], blocks are processed in place,
+        the state is carried between calls.
+
+        Args
+        ----
+            coeff: float
+                pole [0, 1), 0 = no smoothing
+        """
+
+        assert 0 <= coeff < 1, "[ERROR] coeff must be in [0, 1)!"
+        self.coeff = coeff
+        self.state = 0.0
+        self.__response, self.__decay = one_pole_response(coeff=coeff)
+
+    def reset(self, value: float = 0.0) -> None:
+        self.state = value
+
+    def process(self, block: NDArray) -> NDArray:
+        n = len(block)
+        if n == 0:
+            return block
+        if kernels.backend == "numba":
+            self.state = kernels.one_pole(block=block, yprev=self.state, coeff=self.coeff)
+            return block
+        chunks = -(-n // DBLOCK_CHUNK)
+        x = np.zeros(chunks * DBLOCK_CHUNK, dtype=np.float64)
+        np.multiply(block, 1 - self.coeff, out=x[:n])
+        self.state = solve_one_pole(x=x, yprev=self.state, response=self.__response, decay=self.__decay, out=block)
+        return block
+
+    def process_sample(self, sample: float) -> float:
+        self.state = sample * (1 - self.coeff) + self.coeff * self.state
+        return self.state
+
+
+class Gain():
+    def __init__(self, gain: float = 1.0) -> None:
+
+        """
+        INIT GAIN
+
+        Args
+        ----
+            gain: float
+                linear gain (default = 1.0)
+        """
+
+        self.gain = gain
+
+    def process(self, block: NDArray) -> NDArray:
+        block *= self.gain
+        return block
+
+    def process_sample(self, sample: float) -> float:
+        return sample * self.gain
+
+
+class SoftClip():
+    def __init__(self, drive: float = 1.0) -> None:
+
+        """
+        INIT SOFT CLIPPER
+
+        y = tanh(drive * x) / tanh(drive), output in [-1, 1]
+
+        Args
+        ----
+            drive: float
+                input gain before the tanh (default = 1.0)
+        """
+
+        assert drive > 0, "[ERROR] drive must be positive!"
+        self.drive = drive
+        self.__norm = 1 / np.tanh(drive)
+
+    def process(self, block: NDArray) -> NDArray:
+        block *= self.drive
+        np.tanh(block, out=block)
+        block *= self.__norm
+        return block
+
+    def process_sample(self, sample: float) -> float:
+        return math.tanh(self.drive * sample) * self.__norm
+
+
+class FilterChain():
+    def __init__(self, stages: list) -> None:
+
+        """
+        INIT FILTER CHAIN
+
+        Args
+        ----
+            stages: list
+                stages applied in order, each with a process(block) method working in place
+                (DCBlocker, Gain, SoftClip, ...)
+        """
+
+        self.stages = stages
+
+    def append(self, stage: object) -> None:
+        self.stages.append(stage)
+
+    def process(self, block: NDArray) -> NDArray:
+
+        """
+        PROCESS A BLOCK THROUGH EVERY STAGE (in place)
+
+        Args
+        ----
+            block: NDArray
+                1D block
+
+        Returns
+        -------
+            NDArray
+                block
+        """
+
+        for stage in self.stages:
+            stage.process(block)
+        return block
+
+    def process_sample(self, sample: float) -> float:
+
+        """
+        PROCESS ONE SAMPLE THROUGH EVERY STAGE
+
+        Stages without a process_sample method get a one sample block.
+
+        Args
+        ----
+            sample: float
+                input sample
+
+        Returns
+        -------
+            float
+                output sample
+        """
+
+        for stage in self.stages:
+            process_sample = getattr(stage, "process_sample", None)
+            if process_sample is not None:
+                sample = process_sample(sample)
+            else:
+                sample = stage.process(np.array([sample]))[0]
+        return sample
@@ -0,0 +1,192 @@
+from typing import Union
+import threading
+import json
+import time
+import os
+
+MAX_EVENTS = 1_000_000
+HIST_BINS = 64
+
+
+class Instrument():
+    def __init__(self, trace: bool = True, max_events: int = MAX_EVENTS) -> None:
+
+        """
+        INIT INSTRUMENT
+
+        Opt-in profiler for the render hot path. Objects are instrumented by setting their
+        instrument attribute (see attach), with instrument = None (default) the only cost is
+        one None check per block.
+
+        Stages:
+            - wts.block, wts.orbit, wts.lookup, wts.filter, wts.sample, wts.surface_update
+            - orbit.block, orbit.envelope
+            - envelope.block, envelope.create
+            - terrain.surface, terrain.region
+        Counters:
+            - wts.samples, wts.blocks, wts.deadline_misses (block slower than its duration),
+              wts.surface_updates, wts.late_surfaces
+            - terrain.surfaces, terrain.regions
+
+        Args
+        ----
+            trace: bool
+                keep every timed event for the chrome trace export (default = True)
+            max_events: int
+                max number of trace events kept, the oldest are kept (default = 1000000)
+        """
+
+        self.trace = trace
+        self.max_events = max_events
+        self.clock = time.perf_counter_ns
+        self.__lock = threading.Lock()
+        self.__origin = self.clock()
+        self.reset()
+
+    def reset(self) -> None:
+        self.counters = {}
+        self.dropped_events = 0
+        self.__stages = {}
+        self.__events = []
+
+    def attach(self, *objects: object) -> None:
+
+        """
+        INSTRUMENT OBJECTS (WaveTerrainSynthesis, Orbit, Envelope, Terrain)
+        """
+
+        for obj in objects:
+            obj.instrument = self
+
+    @staticmethod
+    def detach(*objects: object) -> None:
+        for obj in objects:
+            obj.instrument = None
+
+    def count(self, name: str, value: int = 1) -> None:
+        with self.__lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    def record(self, stage: str, start: int) -> int:
+
+        """
+        RECORD A STAGE TIMING
+
+        Args
+        ----
+            stage: str
+                stage name
+            start: int
+                stage start time (clock(), ns)
+
+        Returns
+        -------
+            int
+                end time (ns), start of the next stage
+        """
+
+        end = self.clock()
+        duration = end - start
+        with self.__lock:
+            stats = self.__stages.get(stage)
+            if stats is None:
+                stats = self.__stages[stage] = [0, 0, duration, duration, [0] * HIST_BINS]
+            stats[0] += 1
+            stats[1] += duration
+            stats[2] = min(stats[2], duration)
+            stats[3] = max(stats[3], duration)
+            # log2 histogram, bin i holds durations in [2^(i - 1), 2^i) ns
+            stats[4][min(duration.bit_length(), HIST_BINS - 1)] += 1
+            if self.trace:
+                if len(self.__events) < self.max_events:
+                    self.__events.append((stage, start, duration, threading.get_ident()))
+                else:
+                    self.dropped_events += 1
+        return end
+
+    def stats(self) -> dict:
+
+        """
+        STAGE STATISTICS
+
+        Returns
+        -------
+            dict
+                stage -> {calls, total_s, mean_s, min_s, max_s, histogram}, histogram is
+                {upper bound in ns: calls} over the non empty log2 bins
+        """
+
+        with self.__lock:
+            stages = {name: (s[0], s[1], s[2], s[3], list(s[4])) for name, s in self.__stages.items()}
+        return {
+            name: {
+                "calls": calls,
+                "total_s": total * 1e-9,
+                "mean_s": total * 1e-9 / calls,
+                "min_s": tmin * 1e-9,
+                "max_s": tmax * 1e-9,
+                "histogram": {1 << i: n for i, n in enumerate(hist) if n}
+            }
+            for name, (calls, total, tmin, tmax, hist) in stages.items()
+        }
+
+    def report(self) -> str:
+
+        """
+        STAGE TABLE AND COUNTERS (text)
+        """
+
+        stats = self.stats()
+        total = sum(s["total_s"] for s in stats.values()) or 1.0
+        lines = [f"{'stage':>20} {'calls':>10} {'total [s]':>12} {'mean [us]':>12} {'max [us]':>12}"]
+        for name, s in sorted(stats.items(), key=lambda item: -item[1]["total_s"]):
+            lines.append(f"{name:>20} {s['calls']:>10} {s['total_s']:>12.4f} {s['mean_s'] * 1e6:>12.2f} {s['max_s'] * 1e6:>12.2f}")
+        for name, value in sorted(self.counters.items()):
+            lines.append(f"{name:>20} {value:>10}")
+        return "\n".join(lines)
+
+    def to_json(self, path: Union[str, None] = None) -> dict:
+
+        """
+        EXPORT STATS AND COUNTERS AS JSON
+
+        Args
+        ----
+            path: str|None
+                output file (default = None, not written)
+
+        Returns
+        -------
+            dict
+                {"stages": stats(), "counters": counters}
+        """
+
+        data = {"stages": self.stats(), "counters": dict(self.counters)}
+        if path is not None:
+            with open(path, "w") as f:
+                json.dump(data, f, indent=2)
+        return data
+
+    def to_chrome_trace(self, path: str) -> None:
+
+        """
+        EXPORT THE TIMED EVENTS AS A CHROME TRACE (chrome://tracing, perfetto)
+
+        Args
+        ----
+            path: str
+                output .json file
+        """
+
+        pid = os.getpid()
+        with self.__lock:
+            events = list(self.__events)
+            counters = dict(self.counters)
+        trace = [
+            {"name": stage, "cat": stage.split(".")[0], "ph": "X", "ts": (start - self.__origin) / 1e3, "dur": duration / 1e3, "pid": pid, "tid": tid}
+            for stage, start, duration, tid in events
+        ]
+        end = (self.clock() - self.__origin) / 1e3
+        trace += [{"name": name, "ph": "C", "ts": end, "pid": pid, "args": {"value": value}} for name, value in counters.items()]
+        with open(path, "w") as f:
+            json.dump({"traceEvents": trace, "displayTimeUnit": "ns"}, f)
@@ -0,0 +1,171 @@
+from enum import Enum
+from numpy.typing import NDArray
+import numpy as np
+import math
+
+
+class InterpolationTypes(Enum):
+    NEAREST = 1
+    BILINEAR = 2
+    BICUBIC = 3
+
+def lookup(surface: NDArray, x: NDArray, y: NDArray, interpolation: InterpolationTypes) -> NDArray:
+
+    """
+    SURFACE LOOKUP
+
+    Args
+    ----
+        surface: NDArray
+            terrain surface, shape (height, width)
+        x: NDArray
+            column positions in cells (any shape, wrapped around the surface width)
+        y: NDArray
+            row positions in cells (same shape as x, wrapped around the surface height)
+        interpolation: InterpolationTypes
+            lookup mode:
+                NEAREST, truncated cell (same as int(x) % width)
+                BILINEAR, 2x2 cells
+                BICUBIC, 4x4 cells (catmull-rom)
+
+    Returns
+    -------
+        NDArray
+            surface values, same shape as x
+    """
+
+    height, width = surface.shape
+    match interpolation.name:
+        case "NEAREST":
+            return surface[y.astype(np.int64) % height, x.astype(np.int64) % width]
+        case "BILINEAR":
+            x0 = np.floor(x)
+            y0 = np.floor(y)
+            fx = x - x0
+            fy = y - y0
+            cols = x0.astype(np.int64) % width
+            rows = y0.astype(np.int64) % height
+            cols1 = (cols + 1) % width
+            rows1 = (rows + 1) % height
+            s00, s01, s10, s11 = gather(surface=surface, index=[(rows, cols), (rows, cols1), (rows1, cols), (rows1, cols1)])
+            top = s00 + fx * (s01 - s00)
+            bottom = s10 + fx * (s11 - s10)
+            return top + fy * (bottom - top)
+        case "BICUBIC":
+            x0 = np.floor(x)
+            y0 = np.floor(y)
+            wx = catmull_rom(x - x0)
+            wy = catmull_rom(y - y0)
+            cols = [(x0.astype(np.int64) + j - 1) % width for j in range(4)]
+            rows = [(y0.astype(np.int64) + i - 1) % height for i in range(4)]
+            cells = gather(surface=surface, index=[(r, c) for r in rows for c in cols])
+            out = np.zeros(np.shape(x), dtype=surface.dtype)
+            for i in range(4):
+                row = np.zeros(np.shape(x), dtype=surface.dtype)
+                for j in range(4):
+                    row += wx[j] * cells[4 * i + j]
+                out += wy[i] * row
+            return out
+        case _:
+            print("[ERROR] interpolation type not implemented!\n")
+            exit(1)
+
+def gather(surface: NDArray, index: list[tuple[NDArray, NDArray]]) -> list[NDArray]:
+
+    """
+    GATHER SEVERAL CELL FOOTPRINTS OF ONE LOOKUP
+
+    Arrays are indexed once for each (rows, cols) pair. Other surfaces (TiledTerrain)
+    get a single stacked lookup, so every tile the lookup touches is loaded once.
+
+    Args
+    ----
+        surface: NDArray
+            terrain surface, shape (height, width)
+        index: list[tuple[NDArray, NDArray]]
+            row and column indices of each footprint (in range, same shape)
+
+    Returns
+    -------
+        list[NDArray]
+            surface values of each footprint
+    """
+
+    if isinstance(surface, np.ndarray):
+        return [surface[rows, cols] for rows, cols in index]
+    rows = np.stack([r for r, _ in index])
+    cols = np.stack([c for _, c in index])
+    return list(surface[rows, cols])
+
+def lookup_sample(surface: NDArray, x: float, y: float, interpolation: InterpolationTypes) -> float:
+
+    """
+    SURFACE LOOKUP OF ONE POSITION (scalar path of lookup, same values, no array allocations)
+
+    Args
+    ----
+        surface: NDArray
+            terrain surface, shape (height, width)
+        x: float
+            column position in cells
+        y: float
+            row position in cells
+        interpolation: InterpolationTypes
+            lookup mode (see lookup)
+
+    Returns
+    -------
+        float
+            surface value
+    """
+
+    height, width = surface.shape
+    if interpolation is InterpolationTypes.NEAREST:
+        return surface.item(int(y) % height, int(x) % width)
+    x0 = math.floor(x)
+    y0 = math.floor(y)
+    if interpolation is InterpolationTypes.BILINEAR:
+        fx = x - x0
+        fy = y - y0
+        col, row = x0 % width, y0 % height
+        col1, row1 = (col + 1) % width, (row + 1) % height
+        s00, s01 = surface.item(row, col), surface.item(row, col1)
+        s10, s11 = surface.item(row1, col), surface.item(row1, col1)
+        top = s00 + fx * (s01 - s00)
+        bottom = s10 + fx * (s11 - s10)
+        return top + fy * (bottom - top)
+    wx = catmull_rom(x - x0)
+    wy = catmull_rom(y - y0)
+    out = 0.0
+    for i in range(4):
+        r = (y0 + i - 1) % height
+        row = 0.0
+        for j in range(4):
+            row += wx[j] * surface.item(r, (x0 + j - 1) % width)
+        out += wy[i] * row
+    return out
+
+def catmull_rom(t: NDArray) -> tuple[NDArray, NDArray, NDArray, NDArray]:
+
+    """
+    CATMULL-ROM WEIGHTS
+
+    Args
+    ----
+        t: NDArray
+            fractional position between the second and third cell [0, 1)
+
+    Returns
+    -------
+        tuple[NDArray, NDArray, NDArray, NDArray]
+            weights of the 4 cells
+    """
+
+    t2 = t * t
+    t3 = t2 * t
+    return (
+        0.5 * (-t3 + 2 * t2 - t),
+        0.5 * (3 * t3 - 5 * t2 + 2),
+        0.5 * (-3 * t3 + 4 * t2 + t),
+        0.5 * (t3 - t2)
+    )
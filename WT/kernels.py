@@ -0,0 +1,100 @@
+from numpy.typing import NDArray
+import importlib.util
+import os
+
+BACKENDS = ["numpy", "numba"]
+
+backend = "numpy"
+jit_kernels = {}
+
+def numba_available() -> bool:
+    return importlib.util.find_spec("numba") is not None
+
+def get_backend() -> str:
+    return backend
+
+def set_backend(name: str) -> str:
+
+    """
+    SELECT THE KERNEL BACKEND OF THE SAMPLE BY SAMPLE RECURRENCES (dc blocker, one pole smoother)
+
+    Args
+    ----
+        name: str
+            "numpy" (chunked solve, default) or "numba" (compiled sample by sample loops,
+            falls back to "numpy" if numba is not installed)
+
+    Returns
+    -------
+        str
+            selected backend
+    """
+
+    global backend
+    assert name in BACKENDS, f"[ERROR] backend can be only: {BACKENDS}!"
+    if name == "numba" and not numba_available():
+        print("[INFO] numba not installed, numpy backend selected!")
+        name = "numpy"
+    if name == "numba" and not jit_kernels:
+        compile_kernels()
+    backend = name
+    return backend
+
+def compile_kernels() -> None:
+
+    """
+    COMPILE THE NUMBA KERNELS (on first use, cached on disk by numba)
+    """
+
+    # imported here, numba is optional and slow to import
+    from numba import njit
+
+    @njit(cache=True)
+    def dc_block(block, state, coeff):
+        # same recurrence as DCBlocker.process_sample
+        order = state.shape[1]
+        for n in range(block.shape[0]):
+            xtemp = block[n]
+            for i in range(order):
+                yout = xtemp - state[0, i] + coeff * state[1, i]
+                state[0, i] = xtemp
+                state[1, i] = yout
+                xtemp = yout
+            block[n] = xtemp
+
+    @njit(cache=True)
+    def one_pole(block, yprev, coeff):
+        gain = 1 - coeff
+        for n in range(block.shape[0]):
+            yprev = block[n] * gain + coeff * yprev
+            block[n] = yprev
+        return yprev
+
+    jit_kernels["dc_block"] = dc_block
+    jit_kernels["one_pole"] = one_pole
+
+def dc_block(block: NDArray, state: NDArray, coeff: float) -> None:
+
+    """
+    DC BLOCKER CASCADE, numba backend (block and state (2, order) updated in place)
+    """
+
+    jit_kernels["dc_block"](block, state, coeff)
+
+def one_pole(block: NDArray, yprev: float, coeff: float) -> float:
+
+    """
+    ONE POLE LOW PASS, numba backend (block filtered in place)
+
+    Returns
+    -------
+        float
+            last output
+    """
+
+    return jit_kernels["one_pole"](block, yprev, coeff)
+
+
+# opt in from the environment (WT_BACKEND=numba)
+if os.environ.get("WT_BACKEND", "numpy") != "numpy":
+    set_backend(name=os.environ["WT_BACKEND"])
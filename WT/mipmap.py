@@ -0,0 +1,119 @@
+from numpy.typing import NDArray
+from interpolation import InterpolationTypes, lookup
+import numpy as np
+
+MAX_LEVELS = 10
+MIN_LEVEL_SIZE = 4
+
+
+class TerrainPyramid():
+    def __init__(self, surface: NDArray, max_levels: int = MAX_LEVELS) -> None:
+
+        """
+        INIT TERRAIN PYRAMID (mipmap)
+
+        Level 0 is the surface, each next level is low passed ([1, 2, 1] / 4 binomial
+        filter, wrapping around like the lookup) and downsampled by 2 in both directions.
+        Levels stop when a side would go below 4 cells.
+
+        Args
+        ----
+            surface: NDArray
+                terrain surface, shape (height, width)
+            max_levels: int
+                max number of levels, surface included (default = 10)
+        """
+
+        self.levels = [surface]
+        while len(self.levels) < max_levels and min(self.levels[-1].shape) // 2 >= MIN_LEVEL_SIZE:
+            self.levels.append(downsample(surface=self.levels[-1]))
+        height, width = surface.shape
+        # level cells per surface cell
+        self.scales = [(level.shape[0] / height, level.shape[1] / width) for level in self.levels]
+
+    @property
+    def n_levels(self) -> int:
+        return len(self.levels)
+
+    def lookup(self, x: NDArray, y: NDArray, lod: float, interpolation: InterpolationTypes) -> NDArray:
+
+        """
+        LOOKUP AT A LEVEL OF DETAIL
+
+        Args
+        ----
+            x: NDArray
+                column positions in surface (level 0) cells
+            y: NDArray
+                row positions in surface (level 0) cells
+            lod: float
+                level of detail, fractional levels blend the two nearest levels
+            interpolation: InterpolationTypes
+                lookup mode inside each level (see interpolation.py)
+
+        Returns
+        -------
+            NDArray
+                surface values, same shape as x
+        """
+
+        lod = min(max(lod, 0.0), self.n_levels - 1)
+        level = int(lod)
+        frac = lod - level
+        sample = self.__level_lookup(level=level, x=x, y=y, interpolation=interpolation)
+        if frac > 0:
+            upper = self.__level_lookup(level=level + 1, x=x, y=y, interpolation=interpolation)
+            sample += frac * (upper - sample)
+        return sample
+
+    def __level_lookup(self, level: int, x: NDArray, y: NDArray, interpolation: InterpolationTypes) -> NDArray:
+        if level == 0:
+            return lookup(surface=self.levels[0], x=x, y=y, interpolation=interpolation)
+        sy, sx = self.scales[level]
+        return lookup(surface=self.levels[level], x=x * sx, y=y * sy, interpolation=interpolation)
+
+def downsample(surface: NDArray) -> NDArray:
+
+    """
+    LOW PASS AND DOWNSAMPLE BY 2 (wrapping around)
+
+    Args
+    ----
+        surface: NDArray
+            surface, shape (height, width)
+
+    Returns
+    -------
+        NDArray
+            surface, shape (ceil(height / 2), ceil(width / 2))
+    """
+
+    rows = 0.25 * (np.roll(surface, 1, axis=0) + np.roll(surface, -1, axis=0)) + 0.5 * surface
+    rows = rows[::2]
+    cols = 0.25 * (np.roll(rows, 1, axis=1) + np.roll(rows, -1, axis=1)) + 0.5 * rows
+    return np.ascontiguousarray(cols[:, ::2])
+
+def level_of_detail(x: NDArray, y: NDArray, bias: float = 0.0) -> float:
+
+    """
+    LEVEL OF DETAIL OF A BLOCK FROM THE ORBIT SPEED
+
+    Args
+    ----
+        x: NDArray
+            column positions in surface cells (not wrapped), previous position first
+        y: NDArray
+            row positions in surface cells (not wrapped), previous position first
+        bias: float
+            added to the level (default = 0.0, > 0 blurrier, < 0 sharper)
+
+    Returns
+    -------
+        float
+            log2 of the mean distance travelled per sample (cells), >= 0
+    """
+
+    if len(x) < 2:
+        return 0.0
+    speed = np.mean(np.hypot(np.diff(x), np.diff(y)))
+    return max(0.0, float(np.log2(max(speed, 1e-12))) + bias)
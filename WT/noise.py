@@ -0,0 +1,113 @@
+import random
+from numpy.typing import NDArray
+from typing import Union
+import numpy as np
+
+
+def fade(t: NDArray) -> NDArray:
+    return 6 * t ** 5 - 15 * t ** 4 + 10 * t ** 3
+
+
+class GradientNoise():
+    def __init__(self, octaves: float = 1, seed: int = 1) -> None:
+
+        """
+        INIT GRADIENT NOISE
+
+        Vectorized gradient (perlin) noise. Lattice gradients are seeded with the
+        same hash used by perlin_noise.PerlinNoise, so for the same octaves and seed
+        the values agree with the reference implementation (up to rounding).
+
+        Args
+        ----
+            octaves: float
+                number of sub rectangles in each [0, 1] range (default = 1)
+            seed: int
+                noise seed, must be positive (default = 1)
+        """
+
+        assert octaves > 0, "[ERROR] octaves must be a positive number!"
+        assert seed > 0, "[ERROR] seed must be a positive integer!"
+        self.octaves = octaves
+        self.seed = seed
+        self.__gradients = {}
+
+    def __gradient(self, cy: int, cx: int) -> tuple[float, float]:
+        key = (cy, cx)
+        if key not in self.__gradients:
+            rnd = random.Random(self.seed * max(1, abs(cy + 10 * cx + 1)))
+            self.__gradients[key] = (rnd.uniform(-1, 1), rnd.uniform(-1, 1))
+        return self.__gradients[key]
+
+    def lattice(self, y_range: tuple[int, int], x_range: tuple[int, int]) -> tuple[NDArray, NDArray]:
+
+        """
+        LATTICE GRADIENTS
+
+        Args
+        ----
+            y_range: tuple[int, int]
+                first and last (excluded) lattice row
+            x_range: tuple[int, int]
+                first and last (excluded) lattice column
+
+        Returns
+        -------
+            tuple[NDArray, NDArray]
+                y and x components of the gradients, shape (rows, cols)
+        """
+
+        rows = y_range[1] - y_range[0]
+        cols = x_range[1] - x_range[0]
+        gy = np.zeros((rows, cols), dtype=np.float64)
+        gx = np.zeros((rows, cols), dtype=np.float64)
+        for i in range(rows):
+            for j in range(cols):
+                gy[i, j], gx[i, j] = self.__gradient(y_range[0] + i, x_range[0] + j)
+        return gy, gx
+
+    def grid(self, ys: NDArray, xs: NDArray, out: Union[NDArray, None] = None) -> NDArray:
+
+        """
+        EVALUATE NOISE ON A GRID
+
+        Args
+        ----
+            ys: NDArray
+                y coordinates (one for each row)
+            xs: NDArray
+                x coordinates (one for each column)
+            out: NDArray|None
+                output array, shape (len(ys), len(xs)) (default = None, allocated)
+
+        Returns
+        -------
+            NDArray
+                noise values, shape (len(ys), len(xs))
+        """
+
+        ys = np.asarray(ys, dtype=np.float64) * self.octaves
+        xs = np.asarray(xs, dtype=np.float64) * self.octaves
+        fy = np.floor(ys)
+        fx = np.floor(xs)
+        iy = fy.astype(np.int64)
+        ix = fx.astype(np.int64)
+        oy = int(iy.min())
+        ox = int(ix.min())
+        gy, gx = self.lattice(y_range=(oy, int(iy.max()) + 2), x_range=(ox, int(ix.max()) + 2))
+
+        if out is None:
+            out = np.zeros((len(ys), len(xs)), dtype=np.float64)
+        else:
+            out[:] = 0.0
+        # same corner order and operation order as perlin_noise
+        for cy in (0, 1):
+            dy = (ys - (fy + cy))[:, None]
+            wy = fade(1 - np.abs(dy))
+            rows = (iy - oy + cy)[:, None]
+            for cx in (0, 1):
+                dx = (xs - (fx + cx))[None, :]
+                wx = fade(1 - np.abs(dx))
+                cols = (ix - ox + cx)[None, :]
+                out += (wy * wx) * (gy[rows, cols] * dy + gx[rows, cols] * dx)
+        return out
@@ -1,10 +1,10 @@
 from enum import Enum
-from numpy.typing import NDArray
+from numpy.typing import NDArray, DTypeLike
 from typing import Union
 import numpy as np
 from envelopes import Envelope
-import matplotlib.pyplot as plt
-import librosa as lb
+from signals import SignalStream
+from instrument import Instrument
 
 TWOPI = 2 * np.pi
 
@@ -16,7 +16,7 @@ class OrbitTypes(Enum):
 
 class Orbit():
     
-    def __init__(self, orbit_type: OrbitTypes, center: tuple[float, float], envelope: Union[Envelope, None] = None) -> None:
+    def __init__(self, orbit_type: OrbitTypes, center: tuple[float, float], envelope: Union[Envelope, None] = None, seed: Union[int, None] = None, dtype: DTypeLike = np.float64) -> None:
         
         """
         INIT ORBIT
@@ -33,23 +33,46 @@ class Orbit():
                 orbit center [0, 1]
             envelope: Envelope|None
                 envelope object (see envelopes.py)
+            seed: int|None
+                seed of the CAOS orbit random generator (default = None, not reproducible)
+            dtype: DTypeLike
+                dtype of the block coords, np.float64 or np.float32 (default = np.float64)
         """
         
         self.orbit_type = orbit_type
-        self.center = center
+        self.dtype = np.dtype(dtype)
+        self.__cast = self.dtype != np.float64
+        # bumped when center or envelope change (cached orbit dependent state, see WaveTerrainSynthesis)
+        self.version = 0
+        self._center = center
         self._envelope = envelope
         self.__flag = False
         
         self.__sig = None
-        self.__sig_size = 0
-        self.__sx = None
-        self.__sy = None
         self.__ndx_sig = 0
         
+        self.__rng = np.random.default_rng(seed)
+        # profiling hooks, None = disabled (see instrument.py)
+        self.instrument: Union[Instrument, None] = None
+        
+    @property
+    def center(self) -> tuple[float, float]:
+        return self._center
+    
+    @center.setter
+    def center(self, center: tuple[float, float]) -> None:
+        self._center = center
+        self.version += 1
+    
     @property
     def envelope(self) -> int:
         return self._envelope
     
+    @property
+    def periodic(self) -> bool:
+        # the path only depends on the orbit phase (no time factor, envelope, random or signal radius)
+        return self.orbit_type.name == "CIRCULAR" and not self.__flag
+    
     @envelope.setter
     def envelope(self, env: Union[Envelope, None]) -> None:
         if self.orbit_type.name == "SIG":
@@ -60,22 +83,22 @@ class Orbit():
             self.__flag = True
         else:
             self.__flag = False
+        self.version += 1
     
     @property
-    def orbit_sig(self) -> NDArray:
+    def orbit_sig(self) -> Union[SignalStream, None]:
         return self.__sig
     
     @orbit_sig.setter
     def orbit_sig(self, path: str) -> None:
-        sig, _ = lb.load(path, sr=None, mono=False)
-        self.__sig = sig
-        self.__sx = self.__sig[0, :]
-        self.__sy = self.__sx if self.orbit_sig.ndim == 1 else self.__sig[1, :] 
-        self.__sig_size = len(self.__sy)
+        # streamed in chunks (see signals.py), not decoded in memory
+        if self.__sig is not None:
+            self.__sig.close()
+        self.__sig = SignalStream(path=path)
         self.__ndx_sig = 0
         
     
-    def calculate(self, phase: float, freqs: tuple[float, float], max_r: float) -> tuple[float, float]:
+    def calculate(self, phase: float, freqs: tuple[float, float], max_r: float, cycles: Union[tuple[float, float], None] = None, center: Union[tuple[float, float], None] = None) -> tuple[float, float]:
         
         """
         CALCULATE CURRENT COORDS
@@ -88,6 +111,10 @@ class Orbit():
                 x and y freq in Hz
             max_r: float
                 max radius 
+            cycles: tuple[float, float]|None
+                x and y orbit phase in cycles [0, 1) (default = None, freqs * phase)
+            center: tuple[float, float]|None
+                orbit center (default = None, self.center)
 
         Returns
         -------
@@ -96,63 +123,131 @@ class Orbit():
         """
         
         env_factor = self._envelope.generate_env_factor() if self.__flag else 1.0
+        return self.__orbit(phase=phase, freqs=freqs, max_r=max_r, envelope_factor=env_factor, cycles=cycles, center=center)
+    
+    def calculate_block(
+        self,
+        phase: NDArray,
+        freqs: tuple[Union[float, NDArray], Union[float, NDArray]],
+        max_r: Union[float, NDArray],
+        cycles: Union[tuple[NDArray, NDArray], None] = None,
+        center: Union[tuple[Union[float, NDArray], Union[float, NDArray]], None] = None
+    ) -> tuple[NDArray, NDArray]:
+        
+        """
+        CALCULATE COORDS OVER A BLOCK
+        
+        Same values as calling calculate once for each phase value.
+        
+        Args
+        ----
+            phase: NDArray
+                phase of each sample in the block
+            freqs: tuple[float|NDArray, float|NDArray]
+                x and y freq in Hz (constant or one for each sample)
+            max_r: float|NDArray
+                max radius (constant or one for each sample)
+            cycles: tuple[NDArray, NDArray]|None
+                x and y orbit phase in cycles [0, 1) of each sample (default = None, freqs * phase)
+            center: tuple[float|NDArray, float|NDArray]|None
+                orbit center, constant or one for each sample (default = None, self.center)
+
+        Returns
+        -------
+        tuple[NDArray, NDArray]   
+            coords (x, y), one for each phase value
+        """
         
+        prof = self.instrument
+        start = prof.clock() if prof is not None else 0
+        env_factor = self._envelope.generate_env_block(len(phase)) if self.__flag else 1.0
+        if prof is not None:
+            prof.record(stage="orbit.envelope", start=start)
+        if cycles is not None and self.dtype != np.float64:
+            # phase kept in float64 by the caller, trigonometry and coords in the compute dtype
+            cycles = (cycles[0].astype(self.dtype), cycles[1].astype(self.dtype))
+        x, y = self.__orbit(phase=phase, freqs=freqs, max_r=max_r, envelope_factor=env_factor, cycles=cycles, center=center)
+        if prof is not None:
+            prof.record(stage="orbit.block", start=start)
+        return x.astype(self.dtype, copy=False), y.astype(self.dtype, copy=False)
+    
+    def __orbit(self, phase: Union[float, NDArray], freqs: tuple[float, float], max_r: float, envelope_factor: Union[float, NDArray], cycles: Union[tuple, None] = None, center: Union[tuple, None] = None) -> tuple[Union[float, NDArray], Union[float, NDArray]]:
+        # x and y angles, from wrapped phase accumulators when given (precise over long renders)
+        if cycles is None:
+            angles = (TWOPI * freqs[0] * phase, TWOPI * freqs[1] * phase)
+        else:
+            angles = (TWOPI * cycles[0], TWOPI * cycles[1])
+        center = self.center if center is None else center
         match self.orbit_type.name:
             case 'CIRCULAR':
-                return self.__circular_orbit(phase=phase, freqs=freqs, max_r=max_r, envelope_factor=env_factor, mode="circ")
+                return self.__circular_orbit(phase=phase, angles=angles, center=center, max_r=max_r, envelope_factor=envelope_factor, mode="circ")
             case 'SPIRAL':
-                return self.__circular_orbit(phase=phase, freqs=freqs, max_r=max_r, envelope_factor=env_factor, mode="spir")
+                return self.__circular_orbit(phase=phase, angles=angles, center=center, max_r=max_r, envelope_factor=envelope_factor, mode="spir")
             case 'CAOS':
-                return self.__caos_orbit(phase=phase, freqs=freqs, max_r=max_r, envelope_factor=env_factor)
+                return self.__caos_orbit(phase=phase, angles=angles, center=center, max_r=max_r, envelope_factor=envelope_factor)
             case 'SIG':
-               return self.__sig_orbit(phase=phase, freqs=freqs, max_r=max_r, envelope_factor=env_factor)
+               return self.__sig_orbit(phase=phase, angles=angles, center=center, max_r=max_r, envelope_factor=envelope_factor)
             case _:
                 print("[ERROR] orbit type not implemented!\n")
                 exit(1)
         
-    def __circular_orbit(self, phase: float, freqs: tuple[float, float], max_r: float, envelope_factor: float, mode: str) -> tuple[float, float]:
+    def __radii(self, max_r: Union[float, NDArray], center: tuple) -> tuple[Union[float, NDArray], Union[float, NDArray]]:
+        # x and y radii, kept inside the surface (cast only for a non float64 dtype, scalar calls stay cheap)
+        rx = np.minimum(max_r, 1 - center[0])
+        ry = np.minimum(max_r, 1 - center[1])
+        if self.__cast:
+            return rx.astype(self.dtype), ry.astype(self.dtype)
+        return rx, ry
+    
+    def __circular_orbit(self, phase: Union[float, NDArray], angles: tuple, center: tuple, max_r: float, envelope_factor: Union[float, NDArray], mode: str) -> tuple[Union[float, NDArray], Union[float, NDArray]]:
         
-        rx = max_r if max_r <= 1 - self.center[0] else 1 - self.center[0]
-        ry = max_r if max_r <= 1 - self.center[1] else 1 - self.center[1]
+        rx, ry = self.__radii(max_r=max_r, center=center)
         
         factor = envelope_factor if mode == "circ" else envelope_factor * phase
         
         rx = rx * factor
         ry = ry * factor
     
-        x = self.center[0] + rx * np.cos(TWOPI * freqs[0] * phase)
-        y = self.center[1] + ry * np.sin(TWOPI * freqs[1] * phase)
+        x = center[0] + rx * np.cos(angles[0])
+        y = center[1] + ry * np.sin(angles[1])
     
         return x, y
     
-    def __caos_orbit(self, phase: float, freqs: tuple[float, float], max_r: float, envelope_factor: float) -> tuple[float, float]:
+    def __caos_orbit(self, phase: Union[float, NDArray], angles: tuple, center: tuple, max_r: float, envelope_factor: Union[float, NDArray]) -> tuple[Union[float, NDArray], Union[float, NDArray]]:
         
-        rx = max_r if max_r <= 1 - self.center[0] else 1 - self.center[0]
-        ry = max_r if max_r <= 1 - self.center[1] else 1 - self.center[1]
+        rx, ry = self.__radii(max_r=max_r, center=center)
+        
+        # x and y radius are drawn in pairs, so scalar and block calls consume the generator in the same order
+        u = self.__rng.random(size=np.shape(phase) + (2, ))
     
-        x = self.center[0] + np.random.uniform(0, rx * envelope_factor) * np.cos(TWOPI * freqs[0] * phase)
-        y = self.center[1] + np.random.uniform(0, ry * envelope_factor) * np.sin(TWOPI * freqs[1] * phase)
+        x = center[0] + (rx * envelope_factor) * u[..., 0] * np.cos(angles[0])
+        y = center[1] + (ry * envelope_factor) * u[..., 1] * np.sin(angles[1])
     
         return x, y
     
-    def __sig_orbit(self, phase: float, freqs: tuple[float, float], max_r: float, envelope_factor: float) -> tuple[float, float]:
+    def __sig_orbit(self, phase: Union[float, NDArray], angles: tuple, center: tuple, max_r: float, envelope_factor: Union[float, NDArray]) -> tuple[Union[float, NDArray], Union[float, NDArray]]:
                 
         assert self.__sig is not None, "[ERROR] signal not found!\n"
         
-        rx = max_r if max_r <= 1 - self.center[0] else 1 - self.center[0]
-        ry = max_r if max_r <= 1 - self.center[1] else 1 - self.center[1]
+        rx, ry = self.__radii(max_r=max_r, center=center)
         
-        rx = rx if self.__sx[self.__ndx_sig] > rx * envelope_factor else self.__sx[self.__ndx_sig]
-        ry = ry if self.__sy[self.__ndx_sig] > ry * envelope_factor else self.__sy[self.__ndx_sig]
-
-        x = self.center[0] + rx * np.cos(TWOPI * freqs[0] * phase)
-        y = self.center[1] + ry * np.sin(TWOPI * freqs[1] * phase)
+        sx, sy = self.__sig_block(n=np.size(phase))
+        if np.ndim(phase) == 0:
+            sx, sy = sx[0], sy[0]
         
-        self.__ndx_sig += 1
-        self.__ndx_sig %= self.__sig_size
+        rx = np.where(sx > rx * envelope_factor, rx, sx)
+        ry = np.where(sy > ry * envelope_factor, ry, sy)
+
+        x = center[0] + rx * np.cos(angles[0])
+        y = center[1] + ry * np.sin(angles[1])
     
         return x, y
     
+    def __sig_block(self, n: int) -> tuple[NDArray, NDArray]:
+        start = self.__ndx_sig
+        self.__ndx_sig = (start + n) % self.__sig.size
+        return self.__sig.read(start=start, n=n)
+    
     def show_orbit(self, period: float) -> None:
         
         """
@@ -166,28 +261,14 @@ class Orbit():
         
         samples = int(1 / period)
         
-        orbx = np.zeros(samples, dtype=np.float64)
-        orby = np.zeros(samples, dtype=np.float64)
-        phase = 0.0
-        for i in range(samples):
-            match self.orbit_type.name:
-                case "CIRCULAR":
-                    (x, y) = self.__circular_orbit(phase=phase, freqs=(1, 1), max_r=1, envelope_factor=1, mode="circ")
-                case "SPIRAL":
-                    (x, y) = self.__circular_orbit(phase=phase, freqs=(1, 1), max_r=1, envelope_factor=1, mode="spir")
-                case "CAOS":
-                    (x, y) = self.__caos_orbit(phase=phase, freqs=(1, 1), max_r=1, envelope_factor=1)
-                case "SIG":
-                    assert self.__sig is not None, "[ERROR] signal not found!\n"
-                    (x, y) = self.__sig_orbit(phase=phase, freqs=(1, 1), max_r=1, envelope_factor=1)
-                case _:
-                    print(f"[ERROR] show orbit mode not yet implemented!\n")
-                    exit(1)
-                    
-            orbx[i] = x
-            orby[i] = y
-            phase += period
+        phase = np.full(samples, period, dtype=np.float64)
+        phase[0] = 0.0
+        phase = np.cumsum(phase)
+        
+        (orbx, orby) = self.__orbit(phase=phase, freqs=(1, 1), max_r=1, envelope_factor=1)
+        
+        # imported here, plotting is not needed for rendering
+        import matplotlib.pyplot as plt
         
         plt.plot(orbx, orby, lw=0.3)
         plt.show()
-        
\ No newline at end of file
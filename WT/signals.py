@@ -0,0 +1,87 @@
+from numpy.typing import NDArray
+import numpy as np
+
+DEFAULT_BUFFER_FRAMES = 65536
+
+
+class SignalStream():
+    def __init__(self, path: str, buffer_frames: int = DEFAULT_BUFFER_FRAMES) -> None:
+
+        """
+        INIT SIGNAL STREAM
+
+        Reads an audio file in chunks through a read ahead buffer instead of decoding
+        it all in memory. Reads wrap around at the end of the file.
+
+        Args
+        ----
+            path: str
+                audio file path (any format supported by soundfile)
+            buffer_frames: int
+                read ahead buffer size in frames (default = 65536)
+        """
+
+        import soundfile as sf
+
+        self.path = path
+        self.file = sf.SoundFile(path, mode="r")
+        self.size = self.file.frames
+        self.channels = self.file.channels
+        self.sr = self.file.samplerate
+        assert self.size > 0, "[ERROR] empty signal!"
+        self.buffer_frames = min(buffer_frames, self.size)
+
+        self.__buffer = np.zeros((self.buffer_frames, self.channels), dtype=np.float32)
+        self.__buffer_start = -1
+
+    def read(self, start: int, n: int) -> tuple[NDArray, NDArray]:
+
+        """
+        READ n FRAMES FROM start (wrapping around)
+
+        Args
+        ----
+            start: int
+                first frame
+            n: int
+                number of frames
+
+        Returns
+        -------
+            tuple[NDArray, NDArray]
+                x (first channel) and y (second channel, first one if mono) signal,
+                views of the read ahead buffer valid until the next read
+        """
+
+        start %= self.size
+        if n > self.buffer_frames:
+            # longer than the buffer: read in buffer sized pieces
+            x = np.zeros(n, dtype=np.float32)
+            y = np.zeros(n, dtype=np.float32)
+            for i in range(0, n, self.buffer_frames):
+                count = min(self.buffer_frames, n - i)
+                x[i:i + count], y[i:i + count] = self.read(start=start + i, n=count)
+            return x, y
+
+        offset = (start - self.__buffer_start) % self.size if self.__buffer_start >= 0 else self.buffer_frames
+        if offset + n > self.buffer_frames:
+            self.__fill(start=start)
+            offset = 0
+
+        frames = self.__buffer[offset:offset + n]
+        return frames[:, 0], frames[:, 1 if self.channels > 1 else 0]
+
+    def close(self) -> None:
+        self.file.close()
+
+    def __fill(self, start: int) -> None:
+        # buffer_frames frames from start, wrapping around the end of the file
+        filled = 0
+        frame = start
+        while filled < self.buffer_frames:
+            self.file.seek(frame)
+            count = min(self.buffer_frames - filled, self.size - frame)
+            self.file.read(frames=count, dtype="float32", always_2d=True, out=self.__buffer[filled:filled + count])
+            filled += count
+            frame = 0
+        self.__buffer_start = start
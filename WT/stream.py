@@ -0,0 +1,366 @@
+from numpy.typing import NDArray
+from wave_terrain import WaveTerrainSynthesis
+import numpy as np
+import soundfile as sf
+import threading
+import time
+from typing import Union
+
+TWOPI = 2 * np.pi
+
+
+class NullSink():
+
+    """
+    NULL SINK, discards the blocks (headless stand-in for the sound card)
+    """
+
+    def write(self, block: NDArray) -> None:
+        pass
+
+    def close(self) -> None:
+        pass
+
+
+class FileSink():
+    def __init__(self, path: str, sr: int, subtype: str = "PCM_16") -> None:
+
+        """
+        INIT FILE SINK
+
+        Args
+        ----
+            path: str
+                output file path
+            sr: int
+                sampling rate in Hz
+            subtype: str
+                soundfile subtype (default = "PCM_16")
+        """
+
+        self.file = sf.SoundFile(path, mode="w", samplerate=sr, channels=1, subtype=subtype)
+
+    def write(self, block: NDArray) -> None:
+        self.file.write(block)
+
+    def close(self) -> None:
+        self.file.close()
+
+
+class StreamEngine():
+    def __init__(
+        self,
+        wt: WaveTerrainSynthesis,
+        freqs: tuple[float, float],
+        haptic_freq: float,
+        max_r: float,
+        block_size: int = 512,
+        ring_blocks: int = 0
+    ) -> None:
+
+        """
+        INIT STREAM ENGINE
+
+        Fills fixed size buffers from a pull callback. freqs, haptic_freq and max_r
+        can be changed at any time, they are read at the start of each block.
+
+        Args
+        ----
+            wt: WaveTerrainSynthesis
+                synth object (see wave_terrain.py)
+            freqs: tuple[float, float]
+                signal x and y frequencies
+            haptic_freq: float
+                haptic frequency in Hz
+            max_r: float
+                max orbit radius [0, 1]
+            block_size: int
+                samples per buffer (default = 512)
+            ring_blocks: int
+                ring buffer size in blocks (default = 0):
+                    0: blocks are rendered inside the callback
+                    > 0: blocks are rendered ahead by a producer thread (call start())
+        """
+
+        self.wt = wt
+        self.freqs = freqs
+        self.haptic_freq = haptic_freq
+        self.max_r = max_r
+        self.block_size = block_size
+        self.ring_blocks = ring_blocks
+        self.deadline = block_size / wt.sr
+
+        self.blocks = 0
+        self.underruns = 0
+        self.late = 0
+        self.callback_time = 0.0
+        self.max_callback_time = 0.0
+
+        self.__ring = np.zeros((max(ring_blocks, 1), block_size), dtype=wt.dtype)
+        self.__read = 0
+        self.__write = 0
+        self.__running = False
+        self.__producer = None
+        self.__cond = threading.Condition()
+
+    @property
+    def stats(self) -> dict[str, float]:
+
+        """
+        STREAM STATS
+
+        Returns
+        -------
+            dict[str, float]
+                blocks: blocks delivered
+                underruns: blocks not ready in time (silence delivered)
+                late: callbacks that took longer than the buffer deadline
+                deadline: buffer deadline in sec.
+                mean_callback_time: mean callback time in sec.
+                max_callback_time: max callback time in sec.
+        """
+
+        return {
+            "blocks": self.blocks,
+            "underruns": self.underruns,
+            "late": self.late,
+            "deadline": self.deadline,
+            "mean_callback_time": self.callback_time / self.blocks if self.blocks else 0.0,
+            "max_callback_time": self.max_callback_time
+        }
+
+    def start(self) -> None:
+
+        """
+        START THE PRODUCER THREAD (ring buffer mode)
+        """
+
+        assert self.ring_blocks > 0, "[ERROR] producer thread needs ring_blocks > 0!"
+        if self.__running:
+            return
+        self.__running = True
+        self.__producer = threading.Thread(target=self.__produce, daemon=True)
+        self.__producer.start()
+
+    def stop(self) -> None:
+
+        """
+        STOP THE PRODUCER THREAD
+        """
+
+        if not self.__running:
+            return
+        with self.__cond:
+            self.__running = False
+            self.__cond.notify()
+        self.__producer.join()
+        self.__producer = None
+
+    def callback(self, out_buffer: NDArray) -> None:
+
+        """
+        PULL CALLBACK
+
+        Args
+        ----
+            out_buffer: NDArray
+                buffer of block_size samples, filled in place
+        """
+
+        start = time.perf_counter()
+        if self.ring_blocks == 0:
+            self.wt.process_block(out_buffer=out_buffer, freqs=self.freqs, haptic_freq=self.haptic_freq, max_r=self.max_r)
+        else:
+            with self.__cond:
+                available = self.__write - self.__read
+                if available > 0:
+                    out_buffer[:] = self.__ring[self.__read % self.ring_blocks]
+                    self.__read += 1
+                    self.__cond.notify()
+            if available == 0:
+                out_buffer[:] = 0.0
+                self.underruns += 1
+        elapsed = time.perf_counter() - start
+
+        self.blocks += 1
+        self.callback_time += elapsed
+        self.max_callback_time = max(self.max_callback_time, elapsed)
+        if elapsed > self.deadline:
+            self.late += 1
+
+    def run(self, sink: Union[NullSink, FileSink], n_blocks: int, realtime: bool = False) -> None:
+
+        """
+        DRIVE THE STREAM HEADLESS
+
+        Args
+        ----
+            sink: NullSink|FileSink
+                block destination
+            n_blocks: int
+                number of blocks
+            realtime: bool
+                pace the callbacks at the buffer rate, like a sound card (default = False)
+        """
+
+        block = np.zeros(self.block_size, dtype=self.wt.dtype)
+        next_time = time.perf_counter()
+        for _ in range(n_blocks):
+            if realtime:
+                next_time += self.deadline
+                time.sleep(max(0.0, next_time - time.perf_counter()))
+            self.callback(out_buffer=block)
+            sink.write(block)
+
+    def play(self, duration: float) -> None:
+
+        """
+        PLAY ON THE SOUND CARD (needs sounddevice)
+
+        Args
+        ----
+            duration: float
+                duration in sec.
+        """
+
+        import sounddevice as sd
+
+        def device_callback(outdata: NDArray, frames: int, time_info: object, status: sd.CallbackFlags) -> None:
+            if status.output_underflow:
+                self.underruns += 1
+            self.callback(out_buffer=outdata[:, 0])
+
+        with sd.OutputStream(samplerate=self.wt.sr, blocksize=self.block_size, channels=1, dtype="float32", callback=device_callback):
+            sd.sleep(int(duration * 1000))
+
+    def __produce(self) -> None:
+        block = np.zeros(self.block_size, dtype=self.wt.dtype)
+        while True:
+            with self.__cond:
+                while self.__running and self.__write - self.__read >= self.ring_blocks:
+                    self.__cond.wait()
+                if not self.__running:
+                    return
+            self.wt.process_block(out_buffer=block, freqs=self.freqs, haptic_freq=self.haptic_freq, max_r=self.max_r)
+            with self.__cond:
+                self.__ring[self.__write % self.ring_blocks] = block
+                self.__write += 1
+
+
+def master_fade(start: int, n: int, n_samples: int, fade_samples: Union[int, None]) -> Union[NDArray, None]:
+
+    """
+    MASTER ENVELOPE OF THE CHUNK [start, start + n) OF A n_samples LONG RENDER
+
+    Args
+    ----
+        start: int
+            first sample of the chunk
+        n: int
+            chunk length
+        n_samples: int
+            render length
+        fade_samples: int|None
+            fade in and fade out length (half hanning ramps), None: hanning window over the whole
+            render (same values as np.hanning(n_samples))
+
+    Returns
+    -------
+        NDArray|None
+            gains of the chunk, None if the chunk is outside the fades
+    """
+
+    k = np.arange(start, start + n, dtype=np.float64)
+    if fade_samples is None:
+        if n_samples == 1:
+            return np.ones(n, dtype=np.float64)
+        return 0.5 - 0.5 * np.cos(TWOPI * k / (n_samples - 1))
+
+    fade_samples = min(max(fade_samples, 0), n_samples // 2)
+    if fade_samples == 0 or (start >= fade_samples and start + n <= n_samples - fade_samples):
+        return None
+    # rising ramp from both ends, 1.0 in the middle
+    edge = np.minimum(k, n_samples - 1 - k)
+    ramp = np.minimum(edge / fade_samples, 1.0)
+    return 0.5 - 0.5 * np.cos(np.pi * ramp)
+
+def render_to_file(
+    wt: WaveTerrainSynthesis,
+    path: str,
+    n_samples: int,
+    freqs: tuple[float, float],
+    haptic_freq: float,
+    max_r: float,
+    fade: Union[float, None] = 0.05,
+    chunk_size: int = 65536,
+    subtype: str = "PCM_16",
+    progress: float = 1.0
+) -> dict[str, float]:
+
+    """
+    RENDER TO DISK CHUNK BY CHUNK (constant memory, whatever the duration)
+
+    If wt.channels is set the file has one channel for each ChannelTransform
+    (interleaved chunks from wt.process_frames).
+
+    Args
+    ----
+        wt: WaveTerrainSynthesis
+            synth object (see wave_terrain.py)
+        path: str
+            output file path
+        n_samples: int
+            number of samples (frames)
+        freqs: tuple[float, float]
+            signal x and y frequencies
+        haptic_freq: float
+            haptic frequency in Hz
+        max_r: float
+            max orbit radius [0, 1]
+        fade: float|None
+            master fade in and fade out in sec., applied to the edge chunks only (default = 0.05),
+            None: hanning window over the whole render (every chunk)
+        chunk_size: int
+            samples per chunk (default = 65536)
+        subtype: str
+            soundfile subtype (default = "PCM_16")
+        progress: float
+            progress report interval in sec., 0 = silent (default = 1.0)
+
+    Returns
+    -------
+        dict[str, float]
+            samples, elapsed (sec.), realtime_factor (audio sec. per sec.)
+    """
+
+    fade_samples = int(fade * wt.sr) if fade is not None else None
+    frames = min(chunk_size, max(n_samples, 1))
+    n_channels = len(wt.channels) if wt.channels is not None else 1
+    block = np.zeros((frames, n_channels) if wt.channels is not None else frames, dtype=wt.dtype)
+    start = time.perf_counter()
+    next_report = start + progress
+
+    with sf.SoundFile(path, mode="w", samplerate=wt.sr, channels=n_channels, subtype=subtype) as f:
+        for pos in range(0, n_samples, chunk_size):
+            n = min(chunk_size, n_samples - pos)
+            chunk = block[:n]
+            if wt.channels is not None:
+                wt.process_frames(out_buffer=chunk, freqs=freqs, haptic_freq=haptic_freq, max_r=max_r)
+            else:
+                wt.process_block(out_buffer=chunk, freqs=freqs, haptic_freq=haptic_freq, max_r=max_r)
+            gains = master_fade(start=pos, n=n, n_samples=n_samples, fade_samples=fade_samples)
+            if gains is not None:
+                chunk *= gains.reshape((n, ) + (1, ) * (chunk.ndim - 1))
+            f.write(chunk)
+
+            now = time.perf_counter()
+            if progress > 0 and now >= next_report:
+                done = pos + n
+                print(f"[INFO] {100 * done / n_samples:5.1f}% {done / wt.sr:.1f}/{n_samples / wt.sr:.1f} s, {done / wt.sr / (now - start):.1f}x real time")
+                next_report = now + progress
+
+    elapsed = time.perf_counter() - start
+    rtf = n_samples / wt.sr / elapsed if elapsed > 0 else float("inf")
+    if progress > 0:
+        print(f"[INFO] {n_samples / wt.sr:.1f} s rendered to {path} in {elapsed:.2f} s ({rtf:.1f}x real time)")
+    return {"samples": n_samples, "elapsed": elapsed, "realtime_factor": rtf}
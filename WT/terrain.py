@@ -1,51 +1,291 @@
-from perlin_noise import PerlinNoise
-from numpy.typing import NDArray
+from numpy.typing import NDArray, DTypeLike
+from noise import GradientNoise
+from cache import TerrainCache
+from instrument import Instrument
+from mipmap import TerrainPyramid
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from multiprocessing.shared_memory import SharedMemory
+from typing import Union
 import numpy as np
+import weakref
+import random
+
+BAND_PER_WORKER = 4
+
+
+def generate_band(job: tuple) -> None:
+
+    """
+    GENERATE A ROW BAND INTO A SHARED MEMORY SURFACE (process pool worker)
+
+    Args
+    ----
+        job: tuple
+            (terrain, shared memory name, surface shape, rows, time_offset)
+    """
+
+    terrain, name, shape, rows, time_offset = job
+    shm = SharedMemory(name=name)
+    try:
+        surface = np.ndarray(shape, dtype=terrain.dtype, buffer=shm.buf)
+        terrain.generate_region(rows=rows, cols=(0, terrain.width), time_offset=time_offset, out=surface[rows[0]:rows[1]])
+        del surface
+    finally:
+        shm.close()
 
 
 class Terrain():
-    def __init__(self, size: tuple[int, int], xy_incr: tuple[float, float] = (0.01, 0.01), octaves: int = 1, seed: int = 0) -> None:
-        
+    def __init__(self, size: tuple[int, int], xy_incr: tuple[float, float] = (0.01, 0.01), octaves: int = 1, seed: Union[int, None] = None, backend: str = "numpy", cache: Union[TerrainCache, None] = None, workers: int = 1, executor: str = "thread", dtype: DTypeLike = np.float64) -> None:
+
         """
         INIT TERRAIN
-        
+
         Args
         ----
             size: tuple[int, int]
-                size of terrain
+                size of terrain (width, height), the surface has shape (height, width)
             xy_incr: tuple[float, float]
                 x and y increment (perlin noise coordinates, default = (0.01, 0.01))
             octaves: int
                 number of octaves (default = 1)
-            seed: int
-                perlin noise seed (default = 0)
+            seed: int|None
+                perlin noise seed, > 0 (default = None, random seed)
+            backend: str
+                noise backend (default = "numpy"):
+                    "numpy": vectorized gradient noise (see noise.py)
+                    "perlin": perlin_noise package, evaluated cell by cell (reference)
+                NOTE:
+                    - for the same seed, both backends generate the same surface
+            cache: TerrainCache|None
+                on disk surface cache (default = None, see cache.py)
+            workers: int
+                number of threads or processes generating the surface in row bands (default = 1)
+            executor: str
+                parallel generation mode (default = "thread"):
+                    "thread": thread pool
+                    "process": process pool, bands are written in a shared memory surface
+                NOTE:
+                    - the surface is bit identical to the one generated by a single worker
+            dtype: DTypeLike
+                surface dtype, np.float64 or np.float32 (default = np.float64, np.float32 halves
+                the memory and the lookup bandwidth)
         """
-        
+
         self.width = size[0]
         self.height = size[1]
         self.__xoff = xy_incr[0]
         self.__yoff = xy_incr[1]
         self.__startoff = 0.1
-        
-        self.pnoise = PerlinNoise(octaves=octaves, seed=seed)
-        
-    def generate_surface(self) -> NDArray:
-        
+        self.octaves = octaves
+        self.cache = cache
+        executors = ["thread", "process"]
+        assert executor in executors, f"[ERROR] executor can be only: {executors}!"
+        self.workers = workers
+        self.executor = executor
+        self.dtype = np.dtype(dtype)
+        assert self.dtype in (np.float32, np.float64), "[ERROR] dtype can be only float32 or float64!"
+
+        backends = ["numpy", "perlin"]
+        assert backend in backends, f"[ERROR] backend can be only: {backends}!"
+        self.backend = backend
+        # same range as perlin_noise, so both backends share the resolved seed
+        assert seed is None or seed > 0, "[ERROR] seed must be positive (None for a random seed)!"
+        self.seed = seed if seed is not None else random.randint(1, 10**5)
+
+        if self.backend == "perlin":
+            from perlin_noise import PerlinNoise
+            self.pnoise = PerlinNoise(octaves=octaves, seed=self.seed)
+        else:
+            self.pnoise = GradientNoise(octaves=octaves, seed=self.seed)
+
+        self._surface = None
+        self._pyramid = None
+        # profiling hooks, None = disabled (see instrument.py)
+        self.instrument: Union[Instrument, None] = None
+
+    @property
+    def surface(self) -> NDArray:
+
+        """
+        SHARED SURFACE
+
+        Generated (or loaded memory mapped from the cache) on first access and read only,
+        every synth using this terrain reads the same array.
+
+        Returns
+        -------
+            NDArray
+                terrain surface
+        """
+
+        if self._surface is None:
+            if self.cache is not None:
+                surface = self.cache.load(key=self.key, generate=self.generate_surface)
+            else:
+                surface = self.generate_surface()
+                surface.flags.writeable = False
+            self._surface = surface
+        return self._surface
+
+    @property
+    def pyramid(self) -> TerrainPyramid:
+
+        """
+        MIPMAP PYRAMID OF THE SURFACE (built on first access, see mipmap.py)
+        """
+
+        if self._pyramid is None:
+            self._pyramid = TerrainPyramid(surface=self.surface)
+        return self._pyramid
+
+    @property
+    def key(self) -> tuple:
+
+        """
+        SURFACE KEY
+
+        Returns
+        -------
+            tuple
+                parameters that define the surface (size, xy_incr, octaves, seed, backend, dtype)
+        """
+
+        return ((self.width, self.height), (self.__xoff, self.__yoff), self.octaves, self.seed, self.backend, self.dtype.name)
+
+    def xcoords(self) -> NDArray:
+
+        """
+        X NOISE COORDINATES
+
+        Returns
+        -------
+            NDArray
+                noise x coordinate of each column
+        """
+
+        # cumulative sum, same accumulation as the per-cell loop
+        incr = np.full(self.width, self.__xoff, dtype=np.float64)
+        incr[0] = 0
+        return np.cumsum(incr)
+
+    def ycoords(self, time_offset: float = 0.0) -> NDArray:
+
+        """
+        Y NOISE COORDINATES
+
+        Args
+        ----
+            time_offset: float
+                offset added to the first row coordinate (default = 0.0)
+
+        Returns
+        -------
+            NDArray
+                noise y coordinate of each row
+        """
+
+        incr = np.full(self.height, self.__yoff, dtype=np.float64)
+        incr[0] = self.__startoff + time_offset
+        return np.cumsum(incr)
+
+    def generate_surface(self, time_offset: float = 0.0) -> NDArray:
+
         """
         GENERATE SURFACE
-        
+
+        Args
+        ----
+            time_offset: float
+                noise y offset, advancing it moves the terrain through the noise field (default = 0.0)
+
         Returns
         -------
             NDArray
                 terrain surface
         """
-        
-        terrain = np.zeros((self.width, self.height), dtype=np.float64)
-        y = self.__startoff
-        for i in range(self.height):
-            x = 0
-            for j in range(self.width):
-                terrain[i, j] = self.pnoise([y, x])
-                x += self.__xoff
-            y += self.__yoff
-        return terrain
\ No newline at end of file
+
+        prof = self.instrument
+        start = prof.clock() if prof is not None else 0
+        if self.workers > 1:
+            surface = self.__generate_parallel(time_offset=time_offset)
+        else:
+            surface = self.generate_region(rows=(0, self.height), cols=(0, self.width), time_offset=time_offset)
+        if prof is not None:
+            prof.record(stage="terrain.surface", start=start)
+            prof.count(name="terrain.surfaces")
+        return surface
+
+    def generate_region(self, rows: tuple[int, int], cols: tuple[int, int], time_offset: float = 0.0, out: Union[NDArray, None] = None) -> NDArray:
+
+        """
+        GENERATE A REGION OF THE SURFACE
+
+        Same values as the corresponding slice of generate_surface().
+
+        Args
+        ----
+            rows: tuple[int, int]
+                first and last (excluded) row
+            cols: tuple[int, int]
+                first and last (excluded) column
+            time_offset: float
+                noise y offset (default = 0.0)
+            out: NDArray|None
+                output array, shape (rows, cols) (default = None, allocated)
+
+        Returns
+        -------
+            NDArray
+                surface region, shape (rows, cols)
+        """
+
+        prof = self.instrument
+        start = prof.clock() if prof is not None else 0
+        ys = self.ycoords(time_offset=time_offset)[rows[0]:rows[1]]
+        xs = self.xcoords()[cols[0]:cols[1]]
+        match self.backend:
+            case "numpy":
+                out = np.empty((len(ys), len(xs)), dtype=self.dtype) if out is None else out
+                terrain = self.pnoise.grid(ys=ys, xs=xs, out=out)
+            case "perlin":
+                terrain = np.zeros((len(ys), len(xs)), dtype=self.dtype) if out is None else out
+                for i in range(len(ys)):
+                    for j in range(len(xs)):
+                        terrain[i, j] = self.pnoise([ys[i], xs[j]])
+        if prof is not None:
+            prof.record(stage="terrain.region", start=start)
+            prof.count(name="terrain.regions")
+        return terrain
+
+    def __getstate__(self) -> dict:
+        # sent to the process pool without the (possibly large) surface
+        state = self.__dict__.copy()
+        state["_surface"] = None
+        state["_pyramid"] = None
+        state["instrument"] = None
+        return state
+
+    def __generate_parallel(self, time_offset: float) -> NDArray:
+        shape = (self.height, self.width)
+        band = max(1, -(-self.height // (self.workers * BAND_PER_WORKER)))
+        bands = [(r, min(r + band, self.height)) for r in range(0, self.height, band)]
+
+        if self.executor == "thread":
+            surface = np.zeros(shape, dtype=self.dtype)
+            with ThreadPoolExecutor(max_workers=self.workers) as pool:
+                list(pool.map(lambda rows: self.generate_region(rows=rows, cols=(0, self.width), time_offset=time_offset, out=surface[rows[0]:rows[1]]), bands))
+            return surface
+
+        shm = SharedMemory(create=True, size=max(1, self.height * self.width * self.dtype.itemsize))
+        try:
+            with ProcessPoolExecutor(max_workers=self.workers) as pool:
+                list(pool.map(generate_band, [(self, shm.name, shape, rows, time_offset) for rows in bands]))
+        except BaseException:
+            shm.close()
+            shm.unlink()
+            raise
+        # the surface is the shared memory itself (no copy), released with the array
+        shm.unlink()
+        surface = np.ndarray(shape, dtype=self.dtype, buffer=shm.buf)
+        weakref.finalize(surface, shm.close)
+        return surface
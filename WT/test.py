@@ -3,8 +3,7 @@ from wave_terrain import WaveTerrainSynthesis
 from orbits import OrbitTypes, Orbit
 from envelopes import EnvelopeTypes, Envelope
 from terrain import Terrain
-import numpy as np
-import soundfile as sf
+from stream import render_to_file
 
 # main scripts
 WIDTH, HEIGHT = 512, 512
@@ -48,15 +47,8 @@ def main() -> None:
     wt.terrain = terrain
     wt.orbit = orbit
     
-    y = np.zeros(SAMPLE_DUR, dtype=np.float64)
-    for i in range(SAMPLE_DUR):
-        sample = wt.get_sample(freqs=(FREQX, FREQY), haptic_freq=HAPTIC_FREQ, max_r=0.707)
-        y[i] = sample
-    
-    # master envelope
-    y *= np.hanning(SAMPLE_DUR)
-    
-    sf.write("wt.wav", y, SR, "PCM_16")
+    # rendered chunk by chunk straight to disk, master envelope = hanning over the whole sound
+    render_to_file(wt=wt, path="wt.wav", n_samples=SAMPLE_DUR, freqs=(FREQX, FREQY), haptic_freq=HAPTIC_FREQ, max_r=0.707, fade=None, subtype="PCM_16")
 
 
 # [MAIN PROGRAM]: if the module is being run as the main program, it calls the "main()" function
@@ -0,0 +1,130 @@
+from numpy.typing import NDArray, DTypeLike
+from collections import OrderedDict
+from terrain import Terrain
+import numpy as np
+
+DEFAULT_TILE_SIZE = 256
+DEFAULT_MAX_TILES = 256
+
+
+class TiledTerrain():
+    def __init__(self, terrain: Terrain, tile_size: int = DEFAULT_TILE_SIZE, max_tiles: int = DEFAULT_MAX_TILES, dtype: DTypeLike = np.float64) -> None:
+
+        """
+        INIT TILED TERRAIN
+
+        The surface is never allocated as a whole: fixed size tiles are generated on
+        demand (Terrain.generate_region) when a lookup reaches them, and at most
+        max_tiles of them are kept (least recently used are dropped). It can be used
+        in place of a Terrain (wt.terrain = TiledTerrain(...)), its surface is the
+        tiled view itself.
+
+        Args
+        ----
+            terrain: Terrain
+                terrain object (see terrain.py), sizes don't need to be square or multiple of tile_size
+            tile_size: int
+                tile side in cells (default = 256)
+            max_tiles: int
+                max number of tiles kept in memory (default = 256)
+                NOTE:
+                    - a lookup loads each tile it touches once (the whole interpolation footprint
+                      is gathered at once, see interpolation.gather), keep max_tiles above the tiles
+                      an orbit block touches so they are not generated again at the next block
+            dtype: DTypeLike
+                tile storage dtype (default = np.float64, np.float32 halves the memory)
+        """
+
+        self.terrain = terrain
+        self.width = terrain.width
+        self.height = terrain.height
+        self.tile_size = tile_size
+        self.max_tiles = max_tiles
+        self.dtype = np.dtype(dtype)
+        self.tile_rows = -(-self.height // tile_size)
+        self.tile_cols = -(-self.width // tile_size)
+
+        self.generated = 0
+        self.__tiles = OrderedDict()
+
+    @property
+    def surface(self) -> "TiledTerrain":
+        return self
+
+    @property
+    def shape(self) -> tuple[int, int]:
+        return (self.height, self.width)
+
+    @property
+    def cached_tiles(self) -> int:
+        return len(self.__tiles)
+
+    def tile(self, row: int, col: int) -> NDArray:
+
+        """
+        GET A TILE (generated if missing)
+
+        Args
+        ----
+            row: int
+                tile row
+            col: int
+                tile column
+
+        Returns
+        -------
+            NDArray
+                tile values, shape (tile_size, tile_size) or smaller on the last row/column
+        """
+
+        key = (row, col)
+        tile = self.__tiles.get(key)
+        if tile is not None:
+            self.__tiles.move_to_end(key)
+            return tile
+
+        r0 = row * self.tile_size
+        c0 = col * self.tile_size
+        rows = (r0, min(r0 + self.tile_size, self.height))
+        cols = (c0, min(c0 + self.tile_size, self.width))
+        tile = self.terrain.generate_region(rows=rows, cols=cols).astype(self.dtype, copy=False)
+        tile.flags.writeable = False
+        self.generated += 1
+
+        self.__tiles[key] = tile
+        if len(self.__tiles) > self.max_tiles:
+            self.__tiles.popitem(last=False)
+        return tile
+
+    def __getitem__(self, key: tuple[NDArray, NDArray]) -> NDArray:
+
+        """
+        GATHER surface[rows, cols] THROUGH THE TILE INDEX
+
+        Args
+        ----
+            key: tuple[NDArray, NDArray]
+                row and column indices (in range, same shape)
+
+        Returns
+        -------
+            NDArray
+                surface values, same shape as the indices
+        """
+
+        rows, cols = np.broadcast_arrays(*key)
+        shape = rows.shape
+        rows = rows.reshape(-1)
+        cols = cols.reshape(-1)
+        out = np.zeros(rows.shape, dtype=self.dtype)
+
+        tiles = (rows // self.tile_size) * self.tile_cols + cols // self.tile_size
+        order = np.argsort(tiles, kind="stable")
+        bounds = np.flatnonzero(np.diff(tiles[order])) + 1
+        for group in np.split(order, bounds):
+            if len(group) == 0:
+                continue
+            row, col = divmod(int(tiles[group[0]]), self.tile_cols)
+            tile = self.tile(row=row, col=col)
+            out[group] = tile[rows[group] - row * self.tile_size, cols[group] - col * self.tile_size]
+        return out.reshape(shape)
@@ -0,0 +1,188 @@
+from numpy.typing import NDArray
+from wave_terrain import WaveTerrainSynthesis
+from terrain import Terrain
+from orbits import Orbit
+from interpolation import InterpolationTypes, lookup
+from typing import Union
+import numpy as np
+
+STEAL_FADE = 0.005 # sec.
+
+class Voice():
+    def __init__(self, wt: WaveTerrainSynthesis, freqs: tuple[float, float], max_r: float, amp: float, age: int) -> None:
+
+        """
+        INIT VOICE
+
+        Args
+        ----
+            wt: WaveTerrainSynthesis
+                voice synth, reading the shared surface
+            freqs: tuple[float, float]
+                x and y frequencies
+            max_r: float
+                max orbit radius [0, 1]
+            amp: float
+                voice amplitude
+            age: int
+                note on counter, used by voice stealing
+        """
+
+        self.wt = wt
+        self.freqs = freqs
+        self.max_r = max_r
+        self.amp = amp
+        self.age = age
+        self.gain = 1.0
+        self.released = False
+        self.stolen = False
+
+
+class VoiceManager():
+    def __init__(self, terrain: Terrain, n_voices: int = 16, sr: int = 44100, release: float = 0.01, interpolation: InterpolationTypes = InterpolationTypes.NEAREST) -> None:
+
+        """
+        INIT VOICE MANAGER
+
+        Every voice reads the same read only surface (terrain.surface), generated once.
+
+        Args
+        ----
+            terrain: Terrain
+                terrain object (see terrain.py)
+            n_voices: int
+                max number of simultaneous voices (default = 16)
+            sr: int
+                sampling rate in Hz
+            release: float
+                note off fade out in sec. (default = 0.01)
+            interpolation: InterpolationTypes
+                surface lookup mode (default = NEAREST, see interpolation.py)
+        """
+
+        self.terrain = terrain
+        self.surface = terrain.surface
+        self.n_voices = n_voices
+        self.sr = sr
+        self.release = release
+        self.interpolation = interpolation
+        self.voices: list[Union[Voice, None]] = [None] * n_voices
+        self.stolen = 0
+        # stolen voices, still fading out (STEAL_FADE) outside of their slot
+        self.__fading: list[Voice] = []
+        self.__age = 0
+
+    @property
+    def active(self) -> int:
+        return sum(voice is not None for voice in self.voices)
+
+    def note_on(self, orbit: Orbit, freqs: tuple[float, float], max_r: float, amp: float = 1.0) -> int:
+
+        """
+        NOTE ON
+
+        If every voice is busy, the quietest released voice is stolen, otherwise the oldest one.
+        The stolen voice keeps playing outside of its slot with a STEAL_FADE fade out (no click).
+
+        Args
+        ----
+            orbit: Orbit
+                voice orbit (with its envelope, see orbits.py)
+            freqs: tuple[float, float]
+                x and y frequencies
+            max_r: float
+                max orbit radius [0, 1]
+            amp: float
+                voice amplitude (default = 1.0)
+
+        Returns
+        -------
+            int
+                voice index
+        """
+
+        ndx = self.__free_voice()
+        wt = WaveTerrainSynthesis(sr=self.sr)
+        wt.terrain = self.terrain
+        wt.orbit = orbit
+        self.__age += 1
+        self.voices[ndx] = Voice(wt=wt, freqs=freqs, max_r=max_r, amp=amp, age=self.__age)
+        return ndx
+
+    def note_off(self, voice: int) -> None:
+
+        """
+        NOTE OFF
+
+        Args
+        ----
+            voice: int
+                voice index returned by note_on
+        """
+
+        if self.voices[voice] is not None:
+            self.voices[voice].released = True
+
+    def render(self, n_samples: int) -> NDArray:
+
+        """
+        RENDER A BLOCK OF ALL ACTIVE VOICES
+
+        Orbit coords are computed per voice (stolen voices still fading out included), then all
+        voices read the surface in one gather.
+
+        Args
+        ----
+            n_samples: int
+                number of samples
+
+        Returns
+        -------
+            NDArray
+                mix of the active voices
+        """
+
+        out = np.zeros(n_samples, dtype=np.float64)
+        active = [voice for voice in self.voices if voice is not None] + self.__fading
+        if not active:
+            return out
+
+        x = np.zeros((len(active), n_samples), dtype=np.float64)
+        y = np.zeros((len(active), n_samples), dtype=np.float64)
+        for i, voice in enumerate(active):
+            x[i], y[i] = voice.wt.block_coords(n_samples=n_samples, freqs=voice.freqs, max_r=voice.max_r)
+        samples = lookup(surface=self.surface, x=x, y=y, interpolation=self.interpolation)
+
+        release_step = 1 / max(int(self.release * self.sr), 1)
+        steal_step = 1 / max(int(STEAL_FADE * self.sr), 1)
+        for i, voice in enumerate(active):
+            sample = voice.wt.chain.process(block=samples[i])
+            if voice.released:
+                gain = voice.gain - (steal_step if voice.stolen else release_step) * np.arange(1, n_samples + 1)
+                np.maximum(gain, 0.0, out=gain)
+                sample *= gain
+                voice.gain = gain[-1]
+            out += voice.amp * sample
+
+        # faded out voices are freed
+        self.voices = [None if voice is not None and voice.gain == 0.0 else voice for voice in self.voices]
+        self.__fading = [voice for voice in self.__fading if voice.gain > 0.0]
+        return out
+
+    def __free_voice(self) -> int:
+        for ndx, voice in enumerate(self.voices):
+            if voice is None:
+                return ndx
+        self.stolen += 1
+        released = [ndx for ndx, voice in enumerate(self.voices) if voice.released]
+        if released:
+            ndx = min(released, key=lambda ndx: self.voices[ndx].gain)
+        else:
+            ndx = min(range(self.n_voices), key=lambda ndx: self.voices[ndx].age)
+        # fade out instead of cutting it mid waveform
+        voice = self.voices[ndx]
+        voice.released = True
+        voice.stolen = True
+        self.__fading.append(voice)
+        self.voices[ndx] = None
+        return ndx
@@ -1,15 +1,28 @@
 import numpy as np
+from numpy.typing import NDArray, DTypeLike
 from terrain import Terrain
 from orbits import  Orbit
 from envelopes import Envelope
+from evolution import TerrainEvolution
+from interpolation import InterpolationTypes, lookup, lookup_sample
+from filters import FilterChain, DCBlocker
+from instrument import Instrument
+from automation import Automation, Breakpoints, LFO, AUTOMATION_PARAMS
+from mipmap import TerrainPyramid, level_of_detail
+from channels import ChannelTransform, channel_arrays
+from fractions import Fraction
 from typing import Union
+import math
 
 TWOPI = 2 * np.pi
-DBLOCK_ORDER = 3
-DBLOCK_FREQ = 10
+WAVETABLE_MAX_SAMPLES = 1 << 16
+PHASE_BITS = 64
+PHASE_SCALE = 2.0 ** -PHASE_BITS
+PHASE_MASK = (1 << PHASE_BITS) - 1
+MIPMAP_BIAS = -1.5
 
 class WaveTerrainSynthesis():
-    def __init__(self, sr: int = 44100) -> None:
+    def __init__(self, sr: int = 44100, interpolation: InterpolationTypes = InterpolationTypes.NEAREST, dtype: DTypeLike = np.float64) -> None:
         
         """
         INIT WAVA TERRAIN
@@ -18,30 +31,111 @@ class WaveTerrainSynthesis():
         ----
             sr: int
                 sampling frequency in Hz
+            interpolation: InterpolationTypes
+                surface lookup mode, NEAREST, BILINEAR or BICUBIC (default = NEAREST, see interpolation.py)
+            dtype: DTypeLike
+                compute dtype of the output blocks and the dc blocker, np.float64 or np.float32
+                (default = np.float64). For an end to end float32 path create Terrain, Envelope and
+                Orbit with dtype=np.float32 too (bench_dtype.py measures the error against float64)
+        
+        NOTE:
+            - the orbit phase is kept by x and y fixed point accumulators (64 bit, wrapping at one cycle):
+              precise over hours and independent of the block size
+            - periodic orbits (CIRCULAR without envelope) on a static surface are rendered from a
+              wavetable of surface values over one common period of (fx, fy), rebuilt when freqs,
+              center, max_r, orbit, interpolation or surface change (set wavetable = False to disable)
+            - mipmap = True reads the surface from a low passed pyramid level chosen per block
+              from the orbit speed (band limited lookup at high orbit frequencies, see mipmap.py),
+              mipmap_bias shifts the level (> 0 blurrier, < 0 sharper, default = -1.5 to make up
+              for the soft pyramid filter). Pyramids are built when mipmap is switched on and, with
+              an evolution, by its worker next to each new surface (never on the audio path)
+            - channels = [ChannelTransform, ...] enables process_frames / render_frames: every channel
+              follows its own transform of the orbit (see channels.py), the coords of all the channels
+              are computed in one orbit call and read in one gather, then filtered by channel_chain
+              (dc blocker with one state for each channel, applied to the whole interleaved block)
         """
         
         self.sr = sr
+        self._interpolation = interpolation
+        self.dtype = np.dtype(dtype)
+        assert self.dtype in (np.float32, np.float64), "[ERROR] dtype can be only float32 or float64!"
         self._terrain = None
         self._surface = None
         self._surface_width = None
         self._surface_height = None
         self._orbit = None
+        self._evolution = None
+        self.__prev_surface = None
+        self.__fade_pos = 0
+        self.__fade_len = 0
         
-        self.__delayed_samples = np.zeros((2, DBLOCK_ORDER), dtype=np.float64)
+        # post processing, applied in place to every block (more stages can be appended, see filters.py)
+        self.chain = FilterChain(stages=[DCBlocker(sr=self.sr, dtype=self.dtype)])
+        self._wavetable = True
+        self._mipmap = False
+        self.mipmap_bias = MIPMAP_BIAS
+        self.__lod = 0.0
+        self.__last_xy = None
+        self.__pyramids = []
+        # profiling hooks, None = disabled (see instrument.py)
+        self.instrument: Union[Instrument, None] = None
         self.__phase = 0
+        self.__acc = [0, 0]
+        # get_sample state, recomputed when (freqs, max_r, orbit version) change or a setter resets it
+        self.__sample_key = None
+        self.__sample_table = None
+        self.__incr_freqs = None
+        self.__incr = None
+        self.__ramp_key = None
+        self.__ramp = None
+        # parameter automations (see automate) and samples rendered so far (automation time)
+        self.automation = {}
+        self.__clock = 0
         self.__count_terrain_update = 0
-        self.__dcblock_coeff = 1 - (TWOPI * DBLOCK_FREQ / self.sr)
+        
+        self.__table = None
+        self.__table_key = None
+        self.__table_surface = None
+        self.__table_pos = 0
+        
+        self._channels = None
+        self.channel_chain = None
+        self.__channel_acc = None
+        self.__channel_ratios = None
+        self.__channel_scales = None
+        self.__channel_offsets = None
+    
+    @property
+    def interpolation(self) -> InterpolationTypes:
+        return self._interpolation
+    
+    @interpolation.setter
+    def interpolation(self, interpolation: InterpolationTypes) -> None:
+        self._interpolation = interpolation
+        self.__sample_key = None
+    
+    @property
+    def wavetable(self) -> bool:
+        return self._wavetable
+    
+    @wavetable.setter
+    def wavetable(self, wavetable: bool) -> None:
+        self._wavetable = wavetable
+        self.__sample_key = None
     
     @property
     def terrain(self) -> Terrain:
-        return self.terrain
+        return self._terrain
     
     @terrain.setter
     def terrain(self, terrain: Terrain) -> None:
         self._terrain = terrain
-        self._surface = self._terrain.generate_surface()
+        self.__sample_key = None
+        self._surface = self._terrain.surface
         self._surface_width = self._terrain.width
         self._surface_height = self._terrain.height
+        if self._mipmap:
+            self.__build_pyramids()
     
     @property
     def orbit(self) -> Terrain:
@@ -50,7 +144,86 @@ class WaveTerrainSynthesis():
     @orbit.setter
     def orbit(self, orbit: Orbit) -> None:
         self._orbit = orbit
+        self.__sample_key = None
+    
+    @property
+    def evolution(self) -> Union[TerrainEvolution, None]:
+        return self._evolution
+    
+    @evolution.setter
+    def evolution(self, evolution: Union[TerrainEvolution, None]) -> None:
+        self._evolution = evolution
+        self.__prev_surface = None
+        self.__sample_key = None
+        if evolution is not None:
+            self._terrain = evolution.terrain
+            self._surface = evolution.surface
+            self._surface_width = self._terrain.width
+            self._surface_height = self._terrain.height
+            self.__fade_len = int(evolution.crossfade * self.sr)
+            if self._mipmap:
+                self.__build_pyramids()
+    
+    @property
+    def mipmap(self) -> bool:
+        return self._mipmap
+    
+    @mipmap.setter
+    def mipmap(self, mipmap: bool) -> None:
+        self._mipmap = mipmap
+        self.__sample_key = None
+        if mipmap:
+            self.__build_pyramids()
+        else:
+            self.__lod = 0.0
+            self.__last_xy = None
+    
+    @property
+    def channels(self) -> Union[list[ChannelTransform], None]:
+        return self._channels
+    
+    @channels.setter
+    def channels(self, channels: Union[list[ChannelTransform], None]) -> None:
+        # channel phases start from the current orbit phase, plus their offsets
+        self._channels = channels
+        if channels is None:
+            self.channel_chain = None
+            self.__channel_acc = None
+            return
+        phases, self.__channel_ratios, self.__channel_scales, self.__channel_offsets = channel_arrays(channels=channels)
+        acc = [[(self.__acc[i] + int(round(p * 2.0 ** PHASE_BITS))) % (1 << PHASE_BITS) for i, p in enumerate(phase)] for phase in phases.tolist()]
+        self.__channel_acc = np.array(acc, dtype=np.uint64)
+        self.__channel_scales = self.__channel_scales.astype(self.dtype)
+        self.__channel_offsets = self.__channel_offsets.astype(self.dtype)
+        self.channel_chain = FilterChain(stages=[DCBlocker(sr=self.sr, dtype=self.dtype, channels=len(channels))])
+    
+    def automate(self, param: str, source: Union[Breakpoints, LFO, None], smooth: float = 0.0, rate: str = "control") -> None:
         
+        """
+        AUTOMATE A PARAMETER
+        
+        Automated parameters override the values passed to get_sample, render and process_block.
+        They are evaluated once per block (vectorized), time 0 is the first rendered sample.
+        
+        Args
+        ----
+            param: str
+                "freqx", "freqy", "max_r", "center_x" or "center_y"
+            source: Breakpoints|LFO|None
+                control curve (see automation.py), None removes the automation
+            smooth: float
+                one pole smoothing time constant in sec. (default = 0.0, no smoothing)
+            rate: str
+                "control" (one value per block) or "audio" (one value per sample) (default = "control")
+        """
+        
+        assert param in AUTOMATION_PARAMS, f"[ERROR] param can be only: {AUTOMATION_PARAMS}!"
+        self.__sample_key = None
+        if source is None:
+            self.automation.pop(param, None)
+            return
+        self.automation[param] = Automation(source=source, sr=self.sr, smooth=smooth, rate=rate)
+    
 
     def get_sample(self, freqs: tuple[float, float], haptic_freq: float, max_r: float) -> float:
         
@@ -72,31 +245,492 @@ class WaveTerrainSynthesis():
                 current sample
         """
         
-        self.__count_terrain_update += 1
         haptic_sample = int((1 / haptic_freq) * self.sr)
-        self._surface = self._surface if self.__count_terrain_update != 0 else self._terrain.generate_terrain()
+        prof = self.instrument
+        start = prof.clock() if prof is not None else 0
         
-        coords = self._orbit.calculate(phase=self.__phase, freqs=freqs, max_r=max_r)
-        x = int(coords[0] * self._terrain.width) % self._terrain.width
-        y = int(coords[1] * self._terrain.height) % self._terrain.height
+        center = None
+        if self.automation:
+            freqs, max_r, center = self.__automate(n_samples=1, freqs=freqs, max_r=max_r)
         
-        sample = self._surface[y, x]
-        sample_out = self.__dcblock(sample=sample)
+        incrs = self.__increments(freqs=freqs)
+        key = (freqs, max_r, self._orbit.version)
+        if key != self.__sample_key:
+            self.__sample_key = key
+            self.__sample_table = self.__wavetable(freqs=freqs, max_r=max_r)
+        table = self.__sample_table
+        if table is not None:
+            sample = table[self.__table_pos]
+            self.__table_pos = (self.__table_pos + 1) % len(table)
+            self.__count_terrain_update = (self.__count_terrain_update + 1) % haptic_sample
+        else:
+            coords = self._orbit.calculate(phase=self.__phase, freqs=freqs, max_r=max_r, cycles=(self.__acc[0] * PHASE_SCALE, self.__acc[1] * PHASE_SCALE), center=center)
+            sample = self.__read_sample(x=coords[0] * self._terrain.width, y=coords[1] * self._terrain.height, haptic_sample=haptic_sample)
         
+        sample_out = self.chain.process_sample(sample=sample)
         
-        self.__count_terrain_update %= haptic_sample
         self.__phase += 1 / self.sr
+        self.__acc[0] = (self.__acc[0] + incrs[0]) & PHASE_MASK
+        self.__acc[1] = (self.__acc[1] + incrs[1]) & PHASE_MASK
+        self.__clock += 1
+        
+        if prof is not None:
+            prof.record(stage="wts.sample", start=start)
+            prof.count(name="wts.samples")
         
         return sample_out
     
     
-    def __dcblock(self, sample: float) -> float:
-        xtemp = sample
-        yout = 0
-        for i in range(DBLOCK_ORDER):
-            yout = xtemp - self.__delayed_samples[0, i] + self.__dcblock_coeff * self.__delayed_samples[1, i]
-            self.__delayed_samples[0, i] = xtemp
-            self.__delayed_samples[1, i] = yout
-            xtemp = yout
-        return yout
-    
\ No newline at end of file
+    def render(self, n_samples: int, freqs: tuple[float, float], haptic_freq: float, max_r: float) -> NDArray:
+        
+        """
+        RENDER A BLOCK OF SAMPLES
+        
+        Args
+        ----
+            n_samples: int
+                number of samples
+            freqs: tuple[float, float]
+                signal x and y frequencies
+            haptic_freqs: float
+                haptic frequency in Hz. How many times the terrain change in one second
+            max_r: float
+                max orbit radius [0, 1]
+        
+        Returns
+        -------
+            NDArray
+                next n_samples samples (same as calling get_sample n_samples times)
+        """
+        
+        out_buffer = np.zeros(n_samples, dtype=self.dtype)
+        return self.process_block(out_buffer=out_buffer, freqs=freqs, haptic_freq=haptic_freq, max_r=max_r)
+    
+    def process_block(self, out_buffer: NDArray, freqs: tuple[float, float], haptic_freq: float, max_r: float) -> NDArray:
+        
+        """
+        FILL A BLOCK OF SAMPLES
+        
+        Phase, envelope and dc filter state are carried between blocks and shared
+        with get_sample, so block and sample calls can be mixed.
+        
+        Args
+        ----
+            out_buffer: NDArray
+                1D output buffer, filled in place
+            freqs: tuple[float, float]
+                signal x and y frequencies
+            haptic_freqs: float
+                haptic frequency in Hz. How many times the terrain change in one second
+            max_r: float
+                max orbit radius [0, 1]
+        
+        Returns
+        -------
+            NDArray
+                out_buffer
+        """
+        
+        n = len(out_buffer)
+        if n == 0:
+            return out_buffer
+        
+        haptic_sample = int((1 / haptic_freq) * self.sr)
+        prof = self.instrument
+        start = prof.clock() if prof is not None else 0
+        
+        center = None
+        if self.automation:
+            freqs, max_r, center = self.__automate(n_samples=n, freqs=freqs, max_r=max_r)
+        
+        # the block path checks the wavetable itself, get_sample checks it again after
+        self.__sample_key = None
+        table = self.__wavetable(freqs=freqs, max_r=max_r)
+        if table is not None:
+            # table read, the surface is static so haptic updates are no-ops
+            # taken in the table dtype, then cast into out_buffer (can be float64 with a float32 table)
+            out_buffer[:] = np.take(table, np.arange(self.__table_pos, self.__table_pos + n), mode="wrap")
+            self.__count_terrain_update = (self.__count_terrain_update + n) % haptic_sample
+            self.__phase += n / self.sr
+            self.__advance_cycles(n_samples=n, incrs=self.__increments(freqs=freqs))
+            stage = prof.record(stage="wts.lookup", start=start) if prof is not None else 0
+        else:
+            x, y = self.block_coords(n_samples=n, freqs=freqs, max_r=max_r, center=center)
+            self.__set_lod(x=x, y=y)
+            stage = prof.record(stage="wts.orbit", start=start) if prof is not None else 0
+            out_buffer[:] = self.__read_surface(x=x, y=y, haptic_sample=haptic_sample)
+            stage = prof.record(stage="wts.lookup", start=stage) if prof is not None else 0
+        self.chain.process(block=out_buffer)
+        self.__clock += n
+        
+        if prof is not None:
+            end = prof.record(stage="wts.filter", start=stage)
+            prof.record(stage="wts.block", start=start)
+            prof.count(name="wts.samples", value=n)
+            prof.count(name="wts.blocks")
+            if end - start > n * 1e9 / self.sr:
+                prof.count(name="wts.deadline_misses")
+        
+        return out_buffer
+    
+    def render_frames(self, n_frames: int, freqs: tuple[float, float], haptic_freq: float, max_r: float) -> NDArray:
+        
+        """
+        RENDER A MULTICHANNEL BLOCK (needs channels)
+        
+        Args
+        ----
+            n_frames: int
+                number of frames
+            freqs: tuple[float, float]
+                signal x and y frequencies (scaled by each channel ratio)
+            haptic_freqs: float
+                haptic frequency in Hz. How many times the terrain change in one second
+            max_r: float
+                max orbit radius [0, 1]
+        
+        Returns
+        -------
+            NDArray
+                interleaved frames, shape (n_frames, channels) (soundfile layout)
+        """
+        
+        assert self._channels is not None, "[ERROR] channels not set!"
+        out_buffer = np.zeros((n_frames, len(self._channels)), dtype=self.dtype)
+        return self.process_frames(out_buffer=out_buffer, freqs=freqs, haptic_freq=haptic_freq, max_r=max_r)
+    
+    def process_frames(self, out_buffer: NDArray, freqs: tuple[float, float], haptic_freq: float, max_r: float) -> NDArray:
+        
+        """
+        FILL A MULTICHANNEL BLOCK (needs channels)
+        
+        The orbit (envelope, automations, surface updates) advances once per frame for all the
+        channels, the samples are gathered straight in the interleaved layout and filtered in
+        place by channel_chain (all the channels at once, no per channel copies).
+        
+        Args
+        ----
+            out_buffer: NDArray
+                interleaved output buffer, shape (frames, channels), filled in place
+            freqs: tuple[float, float]
+                signal x and y frequencies (scaled by each channel ratio)
+            haptic_freqs: float
+                haptic frequency in Hz. How many times the terrain change in one second
+            max_r: float
+                max orbit radius [0, 1]
+        
+        Returns
+        -------
+            NDArray
+                out_buffer
+        """
+        
+        assert self._channels is not None, "[ERROR] channels not set!"
+        assert out_buffer.ndim == 2 and out_buffer.shape[1] == len(self._channels), "[ERROR] out_buffer shape must be (frames, channels)!"
+        n = len(out_buffer)
+        if n == 0:
+            return out_buffer
+        
+        haptic_sample = int((1 / haptic_freq) * self.sr)
+        prof = self.instrument
+        start = prof.clock() if prof is not None else 0
+        
+        center = None
+        if self.automation:
+            freqs, max_r, center = self.__automate(n_samples=n, freqs=freqs, max_r=max_r)
+        
+        phase = np.full(n, 1 / self.sr, dtype=np.float64)
+        phase[0] = self.__phase
+        phase = np.cumsum(phase)
+        
+        # every channel in one orbit call, shape (channels, frames)
+        cycles = self.__channel_cycles(n_samples=n, freqs=freqs)
+        x, y = self._orbit.calculate_block(phase=phase, freqs=freqs, max_r=max_r, cycles=cycles, center=center)
+        x = (self.__channel_offsets[:, 0] + self.__channel_scales[:, 0] * x) * self._terrain.width
+        y = (self.__channel_offsets[:, 1] + self.__channel_scales[:, 1] * y) * self._terrain.height
+        self.__phase = phase[-1] + 1 / self.sr
+        self.__advance_cycles(n_samples=n, incrs=self.__increments(freqs=freqs))
+        self.__set_lod(x=x[0], y=y[0])
+        stage = prof.record(stage="wts.orbit", start=start) if prof is not None else 0
+        
+        # transposed views, the gather comes out as (frames, channels)
+        out_buffer[:] = self.__read_surface(x=x.T, y=y.T, haptic_sample=haptic_sample)
+        stage = prof.record(stage="wts.lookup", start=stage) if prof is not None else 0
+        self.channel_chain.process(block=out_buffer)
+        self.__clock += n
+        
+        if prof is not None:
+            end = prof.record(stage="wts.filter", start=stage)
+            prof.record(stage="wts.block", start=start)
+            prof.count(name="wts.samples", value=n)
+            prof.count(name="wts.blocks")
+            if end - start > n * 1e9 / self.sr:
+                prof.count(name="wts.deadline_misses")
+        
+        return out_buffer
+    
+    def block_coords(
+        self,
+        n_samples: int,
+        freqs: tuple[Union[float, NDArray], Union[float, NDArray]],
+        max_r: Union[float, NDArray],
+        center: Union[tuple[Union[float, NDArray], Union[float, NDArray]], None] = None
+    ) -> tuple[NDArray, NDArray]:
+        
+        """
+        SURFACE COORDS OF THE NEXT BLOCK
+        
+        Advances phase and orbit (envelope) by n_samples.
+        
+        Args
+        ----
+            n_samples: int
+                number of samples
+            freqs: tuple[float|NDArray, float|NDArray]
+                signal x and y frequencies (constant or one for each sample)
+            max_r: float|NDArray
+                max orbit radius [0, 1] (constant or one for each sample)
+            center: tuple[float|NDArray, float|NDArray]|None
+                orbit center (default = None, orbit.center)
+        
+        Returns
+        -------
+            tuple[NDArray, NDArray]
+                x (column) and y (row) surface positions in cells (not wrapped)
+        """
+        
+        # phase accumulated sample by sample, as in get_sample
+        phase = np.full(n_samples, 1 / self.sr, dtype=np.float64)
+        phase[0] = self.__phase
+        phase = np.cumsum(phase)
+        
+        incrs = self.__increments(freqs=freqs)
+        cycles = self.__block_cycles(n_samples=n_samples, incrs=incrs)
+        coords = self._orbit.calculate_block(phase=phase, freqs=freqs, max_r=max_r, cycles=cycles, center=center)
+        x = coords[0] * self._terrain.width
+        y = coords[1] * self._terrain.height
+        
+        self.__phase = phase[-1] + 1 / self.sr
+        self.__advance_cycles(n_samples=n_samples, incrs=incrs)
+        
+        return x, y
+    
+    def __automate(self, n_samples: int, freqs: tuple[float, float], max_r: float) -> tuple[tuple, Union[float, NDArray], tuple]:
+        # automated values of the next block (scalars for one sample), the others as given
+        values = {"freqx": freqs[0], "freqy": freqs[1], "max_r": max_r, "center_x": self._orbit.center[0], "center_y": self._orbit.center[1]}
+        for param, automation in self.automation.items():
+            value = automation.block(start=self.__clock, n=n_samples)
+            values[param] = value[0] if n_samples == 1 and np.ndim(value) else value
+        return (values["freqx"], values["freqy"]), values["max_r"], (values["center_x"], values["center_y"])
+    
+    def __increment(self, freq: Union[float, NDArray]) -> Union[int, NDArray]:
+        # phase increment per sample, in 2^-64 cycles (one for each sample if freq is an array)
+        if np.ndim(freq) == 0:
+            return int(round(freq / self.sr * 2.0 ** PHASE_BITS)) % (1 << PHASE_BITS)
+        cycles = np.asarray(freq, dtype=np.float64) / self.sr
+        cycles = np.minimum(cycles - np.floor(cycles), np.nextafter(1.0, 0.0))
+        return np.round(cycles * 2.0 ** PHASE_BITS).astype(np.uint64)
+    
+    def __increments(self, freqs: tuple) -> tuple:
+        # x and y increments of the block, cached while freqs are the same scalars
+        if isinstance(freqs[0], (int, float)) and isinstance(freqs[1], (int, float)):
+            if freqs != self.__incr_freqs:
+                self.__incr = (self.__increment(freq=freqs[0]), self.__increment(freq=freqs[1]))
+                self.__incr_freqs = freqs
+            return self.__incr
+        return (self.__increment(freq=freqs[0]), self.__increment(freq=freqs[1]))
+    
+    def __ramps(self, n_samples: int, incrs: tuple[int, int]) -> tuple[NDArray, NDArray]:
+        # k * incr for k in [0, n_samples) (uint64, wrapping), cached for the last block size and increments
+        key = (n_samples, incrs)
+        if key != self.__ramp_key:
+            k = np.arange(n_samples, dtype=np.uint64)
+            self.__ramp = (k * np.uint64(incrs[0]), k * np.uint64(incrs[1]))
+            self.__ramp_key = key
+        return self.__ramp
+    
+    def __block_cycles(self, n_samples: int, incrs: tuple) -> tuple[NDArray, NDArray]:
+        # orbit phase in cycles [0, 1] of the next n_samples samples (uint64 arithmetic wraps at one cycle)
+        ramps = self.__ramps(n_samples=n_samples, incrs=incrs) if isinstance(incrs[0], int) and isinstance(incrs[1], int) else (None, None)
+        cycles = []
+        for acc, incr, ramp in zip(self.__acc, incrs, ramps):
+            if ramp is not None:
+                acc = np.uint64(acc) + ramp
+            elif isinstance(incr, int):
+                acc = np.uint64(acc) + np.arange(n_samples, dtype=np.uint64) * np.uint64(incr)
+            else:
+                acc = np.concatenate(([np.uint64(acc)], incr[:-1])).cumsum(dtype=np.uint64)
+            cycles.append(acc.astype(np.float64) * PHASE_SCALE)
+        return cycles[0], cycles[1]
+    
+    def __channel_cycles(self, n_samples: int, freqs: tuple) -> tuple[NDArray, NDArray]:
+        # orbit phase in cycles of the next n_samples samples of every channel, shape (channels, n_samples)
+        cycles = []
+        for i, freq in enumerate(freqs):
+            if np.ndim(freq) == 0:
+                incr = np.array([self.__increment(freq=freq * ratio) for ratio in self.__channel_ratios[:, i].tolist()], dtype=np.uint64)
+                acc = self.__channel_acc[:, i:i + 1] + np.arange(n_samples, dtype=np.uint64) * incr[:, None]
+                self.__channel_acc[:, i] = acc[:, -1] + incr
+            else:
+                incr = self.__increment(freq=np.multiply.outer(self.__channel_ratios[:, i], freq))
+                acc = np.concatenate((self.__channel_acc[:, i:i + 1], incr[:, :-1]), axis=1).cumsum(axis=1, dtype=np.uint64)
+                self.__channel_acc[:, i] = acc[:, -1] + incr[:, -1]
+            cycles.append(acc.astype(np.float64) * PHASE_SCALE)
+        return cycles[0], cycles[1]
+    
+    def __advance_cycles(self, n_samples: int, incrs: tuple) -> None:
+        for i, incr in enumerate(incrs):
+            total = n_samples * incr if isinstance(incr, int) else int(incr.sum(dtype=np.uint64))
+            self.__acc[i] = (self.__acc[i] + total) % (1 << PHASE_BITS)
+        if self.__table is not None:
+            self.__table_pos = (self.__table_pos + n_samples) % len(self.__table)
+    
+    def __period(self, freqs: tuple[float, float]) -> Union[int, None]:
+        # smallest number of samples after which both x and y phases are back to the start
+        period = 1
+        for freq in freqs:
+            ratio = Fraction(freq / self.sr).limit_denominator(WAVETABLE_MAX_SAMPLES)
+            if abs(float(ratio) - freq / self.sr) > 1e-15:
+                return None
+            period = math.lcm(period, ratio.denominator)
+            if period > WAVETABLE_MAX_SAMPLES:
+                return None
+        return period
+    
+    def __wavetable(self, freqs: tuple[float, float], max_r: float) -> Union[NDArray, None]:
+        
+        """
+        SURFACE VALUES OVER ONE PERIOD OF A PERIODIC ORBIT (None if the orbit can't be tabled)
+        """
+        
+        if not self.wavetable or self.mipmap or self.automation or self._evolution is not None or self.__prev_surface is not None or not self._orbit.periodic:
+            self.__table = None
+            return None
+        
+        key = (self._orbit, tuple(self._orbit.center), tuple(freqs), max_r, self.interpolation, self._terrain.width, self._terrain.height)
+        if self.__table is not None and key == self.__table_key and self.__table_surface is self._surface:
+            return self.__table
+        
+        self.__table = None
+        period = self.__period(freqs=freqs)
+        if period is None:
+            return None
+        
+        # one period from the current phase, the table position follows the accumulators
+        cycles = self.__block_cycles(n_samples=period, incrs=self.__increments(freqs=freqs))
+        x, y = self._orbit.calculate_block(phase=np.full(period, self.__phase), freqs=freqs, max_r=max_r, cycles=cycles)
+        table = lookup(surface=self._surface, x=x * self._terrain.width, y=y * self._terrain.height, interpolation=self.interpolation).astype(self.dtype, copy=False)
+        table.flags.writeable = False
+        
+        self.__table = table
+        self.__table_key = key
+        self.__table_surface = self._surface
+        self.__table_pos = 0
+        return table
+    
+    def __read_surface(self, x: NDArray, y: NDArray, haptic_sample: int) -> NDArray:
+        # the surface is updated every haptic_sample samples, before reading the sample that completes the period
+        # (x and y are (frames, ) or (frames, channels))
+        n = len(x)
+        samples = np.zeros(np.shape(x), dtype=self.dtype)
+        self.__count_terrain_update %= haptic_sample
+        update = haptic_sample - 1 - self.__count_terrain_update
+        start = 0
+        while start < n:
+            if start == update:
+                self.__update_surface()
+                update += haptic_sample
+            stop = min(n, update)
+            samples[start:stop] = self.__lookup(x=x[start:stop], y=y[start:stop])
+            start = stop
+        self.__count_terrain_update = (self.__count_terrain_update + n) % haptic_sample
+        return samples
+    
+    def __read_sample(self, x: float, y: float, haptic_sample: int) -> float:
+        # scalar read of get_sample, same surface updates as __read_surface
+        self.__count_terrain_update %= haptic_sample
+        if self.__count_terrain_update == haptic_sample - 1:
+            self.__update_surface()
+        self.__count_terrain_update = (self.__count_terrain_update + 1) % haptic_sample
+        if self._mipmap or self.__prev_surface is not None or not isinstance(self._surface, np.ndarray):
+            # mipmap level, crossfade or tiled surface: block lookup of one sample
+            x, y = np.array([x]), np.array([y])
+            self.__set_lod(x=x, y=y)
+            return self.__lookup(x=x, y=y)[0]
+        return lookup_sample(surface=self._surface, x=x, y=y, interpolation=self.interpolation)
+    
+    def __update_surface(self) -> None:
+        if self._evolution is None:
+            return
+        prof = self.instrument
+        start = prof.clock() if prof is not None else 0
+        surface = self._evolution.next_surface()
+        if prof is not None:
+            prof.record(stage="wts.surface_update", start=start)
+            prof.count(name="wts.surface_updates" if surface is not None else "wts.late_surfaces")
+        if surface is None:
+            return
+        if self.__fade_len > 0:
+            self.__prev_surface = self._surface
+            self.__fade_pos = 0
+        self._surface = surface
+        if self._mipmap:
+            self.__add_pyramid(pyramid=self._evolution.pyramid)
+    
+    def __set_lod(self, x: NDArray, y: NDArray) -> None:
+        # level of detail of the block, from the distance travelled since the previous sample
+        if not self.mipmap or not isinstance(self._surface, np.ndarray):
+            self.__lod = 0.0
+            self.__last_xy = None
+            return
+        if self.__last_xy is not None:
+            self.__lod = level_of_detail(x=np.concatenate(([self.__last_xy[0]], x)), y=np.concatenate(([self.__last_xy[1]], y)), bias=self.mipmap_bias)
+        else:
+            self.__lod = level_of_detail(x=x, y=y, bias=self.mipmap_bias)
+        self.__last_xy = (x[-1], y[-1])
+    
+    def __build_pyramids(self) -> None:
+        # pyramid of the current surface, built when mipmap, terrain or evolution are set (not in a block)
+        if self._terrain is None or not isinstance(self._surface, np.ndarray):
+            return
+        if self._evolution is None:
+            self._terrain.pyramid
+            return
+        self._evolution.enable_mipmap()
+        self.__add_pyramid(pyramid=self._evolution.pyramid)
+    
+    def __add_pyramid(self, pyramid: Union[TerrainPyramid, None]) -> None:
+        # pyramids of the current and previous surface (crossfade)
+        if pyramid is not None:
+            self.__pyramids = self.__pyramids[-1:] + [(pyramid.levels[0], pyramid)]
+    
+    def __pyramid(self, surface: NDArray) -> Union[TerrainPyramid, None]:
+        # prebuilt pyramid of a surface, the terrain keeps its own
+        if surface is self._terrain._surface:
+            return self._terrain.pyramid
+        for cached, pyramid in self.__pyramids:
+            if cached is surface:
+                return pyramid
+        return None
+    
+    def __surface_lookup(self, surface: NDArray, x: NDArray, y: NDArray) -> NDArray:
+        pyramid = self.__pyramid(surface=surface) if self.__lod > 0 else None
+        if pyramid is None:
+            # level 0 when no pyramid is ready (e.g. surface handed over before mipmap was on)
+            return lookup(surface=surface, x=x, y=y, interpolation=self.interpolation)
+        return pyramid.lookup(x=x, y=y, lod=self.__lod, interpolation=self.interpolation)
+    
+    def __lookup(self, x: NDArray, y: NDArray) -> NDArray:
+        sample = self.__surface_lookup(surface=self._surface, x=x, y=y)
+        if self.__prev_surface is None:
+            return sample
+        # linear crossfade from the previous surface
+        n = len(x)
+        fade = np.minimum((self.__fade_pos + np.arange(1, n + 1)) / self.__fade_len, 1.0).astype(self.dtype)
+        fade = fade.reshape((n, ) + (1, ) * (np.ndim(x) - 1))
+        prev = self.__surface_lookup(surface=self.__prev_surface, x=x, y=y)
+        sample = prev + fade * (sample - prev)
+        self.__fade_pos += n
+        if self.__fade_pos >= self.__fade_len:
+            self.__prev_surface = None
+        return sample